@@ -0,0 +1,22 @@
+#!/bin/bash
+# Compare the wall time of both test suites run with the project settings
+# and with the test settings (settings_test). The first argument is the
+# number of runs per combination, 5 by default.
+
+runs=${1:-5}
+
+for project in "ya_news yanews" "ya_note yanote"; do
+    set -- $project
+    for settings in settings settings_test; do
+        total=0
+        for ((run = 0; run < runs; run++)); do
+            started=$(date +%s%N)
+            (cd "$1" && DJANGO_SETTINGS_MODULE="$2.$settings" pytest -q >/dev/null 2>&1) || {
+                echo "$1 ($2.$settings): тесты упали" 1>&2
+                exit 1
+            }
+            total=$((total + $(date +%s%N) - started))
+        done
+        echo "$1 $2.$settings: $((total / runs / 1000000)) мс в среднем за $runs прогонов"
+    done
+done
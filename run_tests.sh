@@ -14,6 +14,52 @@ print_message () {
     echo -e "${left_filler_len// /$symbol}$message${right_filler_len// /$symbol}\033[0m"
 }
 
+run_parallel () {
+    # Run both projects at once, each sharded across pytest-xdist workers
+    # (first argument: number of workers or "auto"). Every worker process
+    # gets its own in-memory SQLite test database. Logs are printed after
+    # both runs finish, failures are reported in the same order as in the
+    # serial mode.
+    local workers=$1
+    local news_log=$(mktemp)
+    local note_log=$(mktemp)
+    (
+        cd ya_news
+        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings_test"}"
+        pytest --tb=line -n "$workers" >"$news_log" 2>&1
+    ) &
+    local news_pid=$!
+    (
+        cd ya_note
+        export DJANGO_SETTINGS_MODULE="yanote.settings_test"
+        pytest --tb=line -n "$workers" >"$note_log" 2>&1
+    ) &
+    local note_pid=$!
+    wait $news_pid
+    local news_status=$?
+    wait $note_pid
+    local note_status=$?
+    cat "$news_log" "$note_log" 1>&2
+    rm -f "$news_log" "$note_log"
+    if [[ $news_status -ne 0 ]]; then
+        print_message " При запуске упали ваши тесты для проекта YaNews. Проверьте тесты этого проекта " "=" 1
+        echo \`\`\` 1>&2
+        exit $news_status
+    fi
+    if [[ $note_status -ne 0 ]]; then
+        print_message " При запуске упали ваши тесты для проекта YaNote. Проверьте тесты этого проекта " "=" 1
+        echo \`\`\` 1>&2
+        exit $note_status
+    fi
+    exit 0
+}
+
+# bash run_tests.sh --parallel [N] runs the projects concurrently with N
+# pytest workers each (default: one per CPU).
+if [[ "$1" == "--parallel" ]]; then
+    parallel_workers="${2:-auto}"
+fi
+
 
 if python -m flake8 --config=setup.cfg 1>&2;
 then
@@ -21,13 +67,16 @@ then
     echo $LF 1>&2
     if python structure_test.py
     then
+        if [[ -n "$parallel_workers" ]]; then
+            run_parallel "$parallel_workers"
+        fi
         cd ya_news
-        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings"}"
+        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanews.settings_test"}"
         if pytest --tb=line 1>&2;
         then
             cd ../ya_note
             unset DJANGO_SETTINGS_MODULE
-            export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanote.settings"}"
+            export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:="yanote.settings_test"}"
             if pytest --tb=line 1>&2;
             then
                 exit 0
@@ -0,0 +1 @@
+pytest_plugins = ('news.pytest_profiler',)
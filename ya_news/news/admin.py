@@ -1,5 +1,6 @@
 from django.contrib import admin
 
+from .cache import bump_comments_version
 from .models import Comment, News
 
 
@@ -13,3 +14,12 @@ class NewsAdmin(admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+    readonly_fields = ('comment_count',)
+
+    def save_formset(self, request, form, formset, change):
+        """После правки комментариев в админке пересчитываем счётчик."""
+        super().save_formset(request, form, formset, change)
+        news = form.instance
+        bump_comments_version(
+            news.pk, comment_count=news.comment_set.count()
+        )
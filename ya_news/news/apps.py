@@ -1,7 +1,15 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+from .db import check_connections, configure_sqlite
 
 
 class NewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'news'
     verbose_name = 'Новости'
+
+    def ready(self):
+        connection_created.connect(configure_sqlite)
+        request_started.connect(check_connections)
@@ -0,0 +1,323 @@
+"""
+Общие инструменты нагрузочных замеров.
+
+Замеры идут на отдельной временной базе SQLite, которая создаётся
+и удаляется так же, как тестовая: рабочая база не затрагивается.
+WSGI-приложение вызывается напрямую, без HTTP-сервера, из нескольких
+потоков или процессов; ASGI-приложение — из цикла событий asyncio.
+"""
+import asyncio
+import multiprocessing
+import os
+import queue
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import (
+    Future, ProcessPoolExecutor, ThreadPoolExecutor
+)
+from contextlib import contextmanager
+from io import BytesIO
+from urllib.parse import urlencode
+
+from django.db import connection, connections
+from django.utils.crypto import get_random_string
+
+from .middleware import percentile
+
+# Секрет CSRF в cookie и тот же секрет в заголовке проходят проверку
+# CsrfViewMiddleware так же, как токен из формы.
+CSRF_SECRET = get_random_string(32)
+
+
+@contextmanager
+def benchmark_database():
+    """Временная файловая база на время замера."""
+    directory = tempfile.mkdtemp(prefix='bench-')
+    connection.settings_dict['TEST']['NAME'] = os.path.join(
+        directory, 'bench.sqlite3'
+    )
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        # Рядом с базой могут остаться файлы журнала WAL.
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def make_environ(method, path, body=b'', cookies=None):
+    """Окружение WSGI для запроса к приложению."""
+    path, _, query = path.partition('?')
+    cookies = {'csrftoken': CSRF_SECRET, **(cookies or {})}
+    return {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost',
+        'HTTP_COOKIE': '; '.join(f'{k}={v}' for k, v in cookies.items()),
+        'HTTP_X_CSRFTOKEN': CSRF_SECRET,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+
+
+def call_application(application, method, path, body=b'', cookies=None):
+    """Выполняет запрос и возвращает код ответа."""
+    status = []
+    response = application(
+        make_environ(method, path, body, cookies),
+        lambda response_status, headers, exc_info=None: status.append(
+            response_status
+        ),
+    )
+    try:
+        b''.join(response)
+    finally:
+        # Как и сервер, закрываем ответ: это шлёт request_finished.
+        response.close()
+    return int(status[0].split()[0])
+
+
+def _run_plan(application, plan):
+    results = []
+    for route, method, path, body, cookies in plan:
+        started = time.perf_counter()
+        status = call_application(application, method, path, body, cookies)
+        results.append((route, status, time.perf_counter() - started))
+    return results
+
+
+def _run_plan_in_process(plan):
+    # Загружаем WSGI_APPLICATION, как это делает воркер сервера.
+    from django.core.servers.basehttp import get_internal_wsgi_application
+    return _run_plan(get_internal_wsgi_application(), plan)
+
+
+def run_load(application, plans, mode='thread'):
+    """
+    Прогоняет планы запросов параллельно: по потоку или процессу на план.
+
+    План — список (маршрут, метод, путь, тело, cookies). Возвращает
+    результаты (маршрут, код ответа, секунды) и общее время прогона.
+    """
+    connections.close_all()
+    if mode == 'process':
+        executor = ProcessPoolExecutor(
+            len(plans), mp_context=multiprocessing.get_context('fork')
+        )
+        submit = (lambda plan: executor.submit(_run_plan_in_process, plan))
+    else:
+        executor = ThreadPoolExecutor(len(plans))
+        submit = (lambda plan: executor.submit(_run_plan, application, plan))
+    with executor:
+        started = time.perf_counter()
+        futures = [submit(plan) for plan in plans]
+        results = [item for future in futures for item in future.result()]
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def run_slow_clients_wsgi(application, plans, workers, latency):
+    """
+    Медленные клиенты у многопоточного WSGI-сервера.
+
+    Каждый план — отдельный клиент. Запросы встают в общую очередь,
+    которую разбирают workers потоков сервера; поток занят, пока клиент
+    неторопливо отправляет запрос и читает ответ: latency секунд на
+    запрос. Время ответа считается вместе с ожиданием в очереди.
+    """
+    connections.close_all()
+    requests = queue.Queue()
+
+    def worker():
+        while True:
+            item = requests.get()
+            if item is None:
+                return
+            future, (method, path, body, cookies) = item
+            time.sleep(latency)
+            try:
+                future.set_result(call_application(
+                    application, method, path, body, cookies
+                ))
+            except Exception as error:
+                future.set_exception(error)
+
+    def client(plan):
+        results = []
+        for route, *request in plan:
+            started = time.perf_counter()
+            future = Future()
+            requests.put((future, request))
+            status = future.result()
+            results.append((route, status, time.perf_counter() - started))
+        return results
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        with ThreadPoolExecutor(len(plans)) as executor:
+            started = time.perf_counter()
+            futures = [executor.submit(client, plan) for plan in plans]
+            results = [item for future in futures for item in future.result()]
+            elapsed = time.perf_counter() - started
+    finally:
+        for thread in threads:
+            requests.put(None)
+        for thread in threads:
+            thread.join()
+    return results, elapsed
+
+
+def make_scope(method, path, body=b'', cookies=None):
+    """Scope ASGI для HTTP-запроса к приложению."""
+    path, _, query = path.partition('?')
+    cookies = {'csrftoken': CSRF_SECRET, **(cookies or {})}
+    headers = {
+        'host': 'localhost',
+        'cookie': '; '.join(f'{k}={v}' for k, v in cookies.items()),
+        'x-csrftoken': CSRF_SECRET,
+        'content-type': 'application/x-www-form-urlencoded',
+        'content-length': str(len(body)),
+    }
+    return {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [
+            (name.encode(), value.encode()) for name, value in headers.items()
+        ],
+        'server': ('localhost', 80),
+        'client': ('127.0.0.1', 0),
+    }
+
+
+async def call_asgi_application(application, method, path, body=b'',
+                                cookies=None, latency=0):
+    """
+    Выполняет запрос к ASGI-приложению и возвращает код ответа.
+
+    Половину latency клиент отправляет тело запроса, половину —
+    читает ответ; цикл событий в это время свободен.
+    """
+    request_sent = False
+    status = []
+
+    async def receive():
+        nonlocal request_sent
+        if request_sent:
+            return {'type': 'http.disconnect'}
+        request_sent = True
+        await asyncio.sleep(latency / 2)
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif not message.get('more_body'):
+            await asyncio.sleep(latency / 2)
+
+    await application(make_scope(method, path, body, cookies), receive, send)
+    return status[0]
+
+
+def run_slow_clients_asgi(application, plans, latency):
+    """Медленные клиенты у ASGI-сервера: один цикл событий на всех."""
+    connections.close_all()
+    results = []
+
+    async def client(plan):
+        for route, method, path, body, cookies in plan:
+            started = time.perf_counter()
+            status = await call_asgi_application(
+                application, method, path, body, cookies, latency
+            )
+            results.append((route, status, time.perf_counter() - started))
+
+    async def run():
+        await asyncio.gather(*(client(plan) for plan in plans))
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    return results, time.perf_counter() - started
+
+
+def summarize(results, elapsed):
+    """Пропускная способность и задержки по маршрутам, в мс."""
+    def stats(items):
+        timings = sorted(seconds * 1000 for _, _, seconds in items)
+        return {
+            'requests': len(items),
+            'errors': sum(1 for _, status, _ in items if status >= 400),
+            'rps': round(len(items) / elapsed, 1),
+            'p50': round(percentile(timings, 0.5), 2),
+            'p95': round(percentile(timings, 0.95), 2),
+            'p99': round(percentile(timings, 0.99), 2),
+        }
+
+    routes = {}
+    for item in results:
+        routes.setdefault(item[0], []).append(item)
+    return {
+        'elapsed': round(elapsed, 3),
+        'total': stats(results),
+        'routes': {route: stats(items) for route, items in routes.items()},
+    }
+
+
+WORDS = (
+    'новость', 'город', 'студенты', 'практикум', 'робот', 'приложение',
+    'код', 'тесты', 'сервер', 'релиз', 'python', 'django', 'данные',
+)
+
+
+def random_text(generator, words):
+    return ' '.join(generator.choices(WORDS, k=words))
+
+
+def make_plan(generator, mix, requests, news_ids, sessions):
+    """Последовательность запросов одного виртуального пользователя."""
+    routes, weights = zip(*mix.items())
+    plan = []
+    for route in generator.choices(routes, weights, k=requests):
+        news_id = generator.choice(news_ids)
+        cookies = generator.choice(sessions)
+        if route == 'home':
+            plan.append((route, 'GET', '/', b'', None))
+        elif route == 'detail':
+            plan.append((route, 'GET', f'/news/{news_id}/', b'', cookies))
+        else:
+            body = urlencode({'text': 'Нагрузочный комментарий'}).encode()
+            plan.append((route, 'POST', f'/news/{news_id}/', body, cookies))
+    return plan
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        route, _, weight = part.partition('=')
+        mix[route.strip()] = float(weight)
+    return mix
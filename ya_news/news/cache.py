@@ -0,0 +1,155 @@
+"""
+Кэш отрисованной ленты комментариев новости и целых страниц.
+
+HTML комментариев хранится в кэше под ключом с номером версии ленты,
+News.comments_version. Любая запись в ленту (создание, правка, удаление
+комментария) поднимает версию в той же транзакции, и следующий запрос
+отрисовывает ленту заново, а старые записи просто истекают. Версия
+хранится в базе, поэтому даже кэш в памяти каждого процесса не отдаёт
+ленту, устаревшую после записи в другом процессе. Ссылки
+«Редактировать» и «Удалить» зависят от пользователя и выводятся
+в шаблоне вне закэшированного HTML.
+
+Страницы для анонимов хранятся в отдельном кэше NEWS_PAGE_CACHE вместе
+с версией, для которой они отрисованы. Версия страницы считается одним
+запросом по тем полям новостей, которые страница выводит, поэтому
+и она берётся из базы, а не из кэша процесса. Устаревшую страницу
+перестраивает один запрос, а остальные тем временем получают прежнюю
+копию.
+"""
+import hashlib
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db.models import F
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+
+from .models import Comment, News
+from .pagination import paginate
+
+COMMENT_ORDERING = ('created', 'id')
+
+CachedComment = namedtuple('CachedComment', ('pk', 'author_id', 'html'))
+
+# Поля новостей, которые выводят главная страница и страница новости.
+HOME_PAGE_FIELDS = ('pk', 'title', 'text', 'date', 'comment_count')
+DETAIL_PAGE_FIELDS = HOME_PAGE_FIELDS + ('comments_version',)
+
+
+def bump_comments_version(news_pk, **fields):
+    """
+    Сбрасывает закэшированную ленту комментариев новости.
+
+    fields обновляются тем же запросом, например счётчик комментариев.
+    Вызывается в транзакции, которая меняет комментарии.
+    """
+    News.objects.filter(pk=news_pk).update(
+        comments_version=F('comments_version') + 1, **fields
+    )
+
+
+def comment_thread(news, cursor=None):
+    """
+    Страница ленты комментариев новости news.
+
+    Возвращает список CachedComment и курсор следующей страницы (или
+    None). Для испорченного курсора поднимает ValueError.
+    """
+    key = f'news:{news.pk}:comments:{news.comments_version}:{cursor or ""}'
+    page = cache.get(key)
+    if page is None:
+        comments, next_cursor = paginate(
+            Comment.objects.filter(news_id=news.pk).select_related('author'),
+            COMMENT_ORDERING,
+            cursor=cursor,
+            size=settings.COMMENTS_COUNT_ON_DETAIL_PAGE,
+        )
+        thread = [
+            CachedComment(
+                comment.pk,
+                comment.author_id,
+                render_to_string(
+                    'includes/comment.html', {'comment': comment}
+                ),
+            )
+            for comment in comments
+        ]
+        page = (thread, next_cursor)
+        cache.set(key, page, settings.COMMENTS_CACHE_TIMEOUT)
+    return page
+
+
+def page_version(news_pk=None):
+    """
+    Версия главной страницы или, если указан news_pk, страницы новости.
+
+    Это хэш выводимых страницей полей: новостей главной или новости
+    с версией её ленты комментариев. Любая запись в эти поля, в каком бы
+    процессе она ни случилась, даёт новую версию.
+    """
+    if news_pk is None:
+        rows = News.objects.values_list(*HOME_PAGE_FIELDS)[
+            :settings.NEWS_COUNT_ON_HOME_PAGE
+        ]
+    else:
+        rows = News.objects.filter(pk=news_pk).values_list(
+            *DETAIL_PAGE_FIELDS
+        )
+    return hashlib.md5(repr(list(rows)).encode()).hexdigest()
+
+
+def _page_response(entry):
+    _, _, content, headers = entry
+    response = HttpResponse(content)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def cached_page(path, version, render):
+    """
+    Страница path из кэша; render() отрисовывает её заново.
+
+    Свежая копия отдаётся сразу. Устаревшую или отрисованную для другой
+    версии перестраивает тот запрос, который первым взял блокировку,
+    а остальные отдают прежнюю копию. Если копии нет вовсе, остальные
+    ждут её до NEWS_PAGE_CACHE_LOCK_TIMEOUT секунд. Сохраняются только
+    ответы 200.
+    """
+    page_cache = caches[settings.NEWS_PAGE_CACHE]
+    key = 'news:page:' + hashlib.md5(path.encode()).hexdigest()
+    lock_key = f'{key}:lock'
+    lock_timeout = settings.NEWS_PAGE_CACHE_LOCK_TIMEOUT
+    entry = page_cache.get(key)
+    if entry is not None and entry[0] == version and entry[1] > time.time():
+        return _page_response(entry)
+    locked = page_cache.add(lock_key, True, lock_timeout)
+    if not locked:
+        if entry is not None:
+            return _page_response(entry)
+        deadline = time.monotonic() + lock_timeout
+        while entry is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = page_cache.get(key)
+        if entry is not None:
+            return _page_response(entry)
+    try:
+        response = render()
+        if response.status_code == 200:
+            entry = (
+                version,
+                time.time() + settings.NEWS_PAGE_CACHE_TIMEOUT,
+                response.content,
+                dict(response.items()),
+            )
+            page_cache.set(
+                key, entry, settings.NEWS_PAGE_CACHE_TIMEOUT
+                + settings.NEWS_PAGE_CACHE_STALE_TIMEOUT,
+            )
+        return response
+    finally:
+        if locked:
+            page_cache.delete(lock_key)
@@ -0,0 +1,63 @@
+"""
+Настройка соединений с базой.
+
+При открытии каждого соединения выполняет PRAGMA из настройки
+SQLITE_PRAGMAS: журнал WAL позволяет читателям не ждать пишущего,
+synchronous=NORMAL в режиме WAL убирает fsync на каждую транзакцию,
+mmap_size и cache_size уменьшают число системных вызовов чтения,
+busy_timeout заставляет ждать блокировку вместо ошибки
+«database is locked».
+
+Транзакции transaction.atomic() начинаются с BEGIN IMMEDIATE:
+отложенная транзакция, которая сначала читает, а потом пишет,
+при повышении блокировки получает «database is locked» сразу,
+не дожидаясь busy_timeout.
+
+Постоянные соединения (CONN_MAX_AGE) перед каждым запросом
+проверяются на живость, если в настройках базы включён
+CONN_HEALTH_CHECKS, а при старте процесса могут быть открыты заранее.
+"""
+from django.conf import settings
+from django.db import connections
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    """Обработчик сигнала connection_created."""
+    if connection.vendor != 'sqlite':
+        return
+    # Напрямую через sqlite3: служебные запросы не попадают в журнал
+    # запросов Django и в бюджеты запросов тестов.
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+    connection._start_transaction_under_autocommit = (
+        lambda: connection.cursor().execute('BEGIN IMMEDIATE')
+    )
+
+
+def check_connections(**kwargs):
+    """
+    Обработчик сигнала request_started: закрывает постоянные соединения,
+    которые перестали отвечать, например после перезапуска сервера базы.
+
+    Повторяет CONN_HEALTH_CHECKS из Django 4.1: иначе первый запрос
+    на таком соединении завершится ошибкой.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def warm_up_connections():
+    """
+    Открывает соединения со всеми базами при старте процесса.
+
+    Первому запросу воркера не приходится ждать соединения и PRAGMA.
+    Имеет смысл только при CONN_MAX_AGE > 0: иначе соединение закроется
+    в начале первого же запроса.
+    """
+    for connection in connections.all():
+        connection.ensure_connection()
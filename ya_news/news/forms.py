@@ -1,7 +1,9 @@
+from django.conf import settings
 from django.forms import ModelForm
 from django.core.exceptions import ValidationError
 
 from .models import Comment
+from .moderation import WordMatcher, load_words
 
 BAD_WORDS = (
     'редиска',
@@ -9,6 +11,9 @@ BAD_WORDS = (
     # Дополните список на своё усмотрение.
 )
 WARNING = 'Не ругайтесь!'
+BAD_WORDS_MATCHER = WordMatcher(
+    BAD_WORDS + load_words(settings.BAD_WORDS_FILE)
+)
 
 
 class CommentForm(ModelForm):
@@ -17,11 +22,12 @@ class CommentForm(ModelForm):
         model = Comment
         fields = ('text',)
 
+    # Подменяемый объект с методом search(text).
+    bad_words_matcher = BAD_WORDS_MATCHER
+
     def clean_text(self):
         """Не позволяем ругаться в комментариях."""
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        if self.bad_words_matcher.search(text):
+            raise ValidationError(WARNING)
         return text
@@ -0,0 +1,71 @@
+import json
+import random
+
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+
+from news.benchmarks import (
+    benchmark_database, make_plan, parse_mix, run_slow_clients_asgi,
+    run_slow_clients_wsgi, summarize,
+)
+from news.seeding import seed_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает многопоточный WSGI и ASGI с асинхронными страницами '
+        'новостей на множестве медленных клиентов. Выводит отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=20,
+                            help='Комментариев на новость.')
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--clients', type=int, default=200,
+                            help='Одновременных клиентов.')
+        parser.add_argument('--workers', type=int, default=8,
+                            help='Потоков WSGI-сервера.')
+        parser.add_argument('--latency', type=float, default=0.1,
+                            help='Задержка клиента на запрос, в секундах.')
+        parser.add_argument('--requests', type=int, default=10,
+                            help='Запросов на одного клиента.')
+        parser.add_argument(
+            '--mix', type=parse_mix, default='home=50,detail=50',
+            help='Доли маршрутов home, detail и comment.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        generator = random.Random(options['seed'])
+        report = {}
+        with benchmark_database():
+            news_ids, sessions = seed_benchmark(
+                options['news'], options['comments'], options['users'],
+                seed=options['seed'],
+            )
+            plans = [
+                make_plan(
+                    generator, options['mix'], options['requests'],
+                    news_ids, sessions,
+                )
+                for _ in range(options['clients'])
+            ]
+            report['wsgi'] = summarize(*run_slow_clients_wsgi(
+                get_wsgi_application(), plans, options['workers'],
+                options['latency'],
+            ))
+            with override_settings(ROOT_URLCONF='yanews.urls_asgi'):
+                report['asgi'] = summarize(*run_slow_clients_asgi(
+                    get_asgi_application(), plans, options['latency'],
+                ))
+        report['config'] = {
+            key: options[key] for key in (
+                'clients', 'workers', 'latency', 'requests', 'mix', 'seed',
+            )
+        }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
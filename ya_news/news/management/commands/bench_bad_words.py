@@ -0,0 +1,90 @@
+import random
+from timeit import timeit
+
+from django.core.management.base import BaseCommand
+
+from news.moderation import WordMatcher
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def naive_search(words, text):
+    """Прежняя проверка: поиск каждого слова в тексте по очереди."""
+    lowered_text = text.lower()
+    for word in words:
+        if word in lowered_text:
+            return word
+    return None
+
+
+def without_words(matcher, text):
+    """
+    Текст, в котором разорваны пробелом все найденные слова списка.
+
+    Пробел не входит ни в одно слово, поэтому новых совпадений замена
+    не создаёт.
+    """
+    word = matcher.search(text)
+    while word is not None:
+        end = text.find(word) + len(word) - 1
+        text = text[:end] + ' ' + text[end + 1:]
+        word = matcher.search(text)
+    return text
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время проверки одного комментария на запрещённые '
+        'слова перебором и WordMatcher для разных размеров списка.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+',
+            default=(10, 100, 1000, 10000, 50000),
+            help='Размеры списка запрещённых слов.',
+        )
+        parser.add_argument(
+            '--text-length', type=int, default=1000,
+            help='Длина проверяемого комментария в символах.',
+        )
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        generator = random.Random(options['seed'])
+        # Текст из тех же букв, что и слова: движок регулярного
+        # выражения проходит по веткам дерева, как на настоящем
+        # комментарии. Совпадения потом разрываются, чтобы обе проверки
+        # просматривали текст до конца — это худший для них случай.
+        text = ''.join(
+            generator.choice(ALPHABET + ' ')
+            for _ in range(options['text_length'])
+        )
+        repeat = options['repeat']
+        self.stdout.write(
+            f'{"слов":>8} {"сборка, мс":>12} '
+            f'{"перебор, мкс":>14} {"matcher, мкс":>14}'
+        )
+        for size in options['sizes']:
+            words = [
+                ''.join(
+                    generator.choice(ALPHABET)
+                    for _ in range(generator.randint(4, 10))
+                )
+                for _ in range(size)
+            ]
+            build = timeit(lambda: WordMatcher(words), number=1)
+            matcher = WordMatcher(words)
+            clean_text = without_words(matcher, text)
+            naive = timeit(
+                lambda: naive_search(words, clean_text), number=repeat
+            )
+            compiled = timeit(
+                lambda: matcher.search(clean_text), number=repeat
+            )
+            self.stdout.write(
+                f'{size:>8} {build * 1e3:>12.1f} '
+                f'{naive / repeat * 1e6:>14.1f} '
+                f'{compiled / repeat * 1e6:>14.1f}'
+            )
@@ -0,0 +1,81 @@
+import json
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from news.benchmarks import (
+    benchmark_database, make_plan, parse_mix, run_load, summarize
+)
+from news.seeding import seed_benchmark
+from news.middleware import percentile
+
+# CONN_MAX_AGE и DATABASE_WARM_UP сравниваемых режимов.
+PROFILES = {
+    'per_request': (0, False),
+    'persistent': (600, True),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает задержку запросов воркеров, открывающих соединение '
+        'с базой на каждый запрос, и воркеров с постоянным, заранее '
+        'открытым соединением. Выводит отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=20,
+                            help='Комментариев на новость.')
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на один процесс.')
+        parser.add_argument(
+            '--mix', type=parse_mix, default='home=50,detail=50',
+            help='Доли маршрутов home, detail и comment.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def run(self, options):
+        generator = random.Random(options['seed'])
+        with benchmark_database():
+            news_ids, sessions = seed_benchmark(
+                options['news'], options['comments'], options['users'],
+                seed=options['seed'],
+            )
+            plans = [
+                make_plan(
+                    generator, options['mix'], options['requests'],
+                    news_ids, sessions,
+                )
+                for _ in range(options['concurrency'])
+            ]
+            results, elapsed = run_load(None, plans, 'process')
+        report = summarize(results, elapsed)
+        # Результаты идут подряд по процессам: первый запрос каждого
+        # показывает, сколько стоит холодный старт воркера.
+        first = sorted(
+            results[index][2] * 1000
+            for index in range(0, len(results), options['requests'])
+        )
+        report['first_request_p50'] = round(percentile(first, 0.5), 2)
+        return report
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        max_age = connection.settings_dict['CONN_MAX_AGE']
+        warm_up = settings.DATABASE_WARM_UP
+        report = {}
+        try:
+            for name, (profile_max_age, profile_warm_up) in PROFILES.items():
+                # Процессы нагрузки наследуют настройки при fork.
+                connection.settings_dict['CONN_MAX_AGE'] = profile_max_age
+                settings.DATABASE_WARM_UP = profile_warm_up
+                report[name] = self.run(options)
+        finally:
+            connection.settings_dict['CONN_MAX_AGE'] = max_age
+            settings.DATABASE_WARM_UP = warm_up
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
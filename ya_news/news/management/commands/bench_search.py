@@ -0,0 +1,53 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.benchmarks import benchmark_database
+from news.search import search_news
+from news.seeding import seed_news
+
+QUERIES = ('python', 'робот сервер', 'релиз код тесты', 'прак', 'нет такого')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет поиск по новостям и комментариям на временной базе '
+        'с заданным числом строк. Выводит время каждого запроса в мс '
+        'и число найденных новостей в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=20000)
+        parser.add_argument('--comments', type=float, default=10,
+                            help='Среднее число комментариев на новость.')
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument(
+            '--queries', type=lambda value: value.split(','),
+            default=QUERIES, help='Запросы через запятую.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        report = {}
+        with benchmark_database():
+            report['rows'] = seed_news(
+                options['news'], options['comments'], options['users'],
+                seed=options['seed'],
+            )
+            for query in options['queries']:
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    found = search_news(query, settings.NEWS_SEARCH_RESULTS)
+                    timings.append((time.perf_counter() - started) * 1000)
+                report[query] = {
+                    'found': len(found),
+                    'mean': round(statistics.mean(timings), 2),
+                    'min': round(min(timings), 2),
+                }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
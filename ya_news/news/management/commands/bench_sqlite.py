@@ -0,0 +1,66 @@
+import json
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from news.benchmarks import (
+    benchmark_database, make_plan, parse_mix, run_load, summarize
+)
+from news.seeding import seed_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность чтения и записи комментариев '
+        'несколькими процессами со стандартными настройками SQLite '
+        'и с SQLITE_PRAGMAS. Выводит отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument('--comments', type=int, default=20,
+                            help='Комментариев на новость.')
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=100,
+                            help='Запросов на один процесс.')
+        parser.add_argument(
+            '--mix', type=parse_mix, default='detail=50,comment=50',
+            help='Доли маршрутов home, detail и comment.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def run(self, options):
+        generator = random.Random(options['seed'])
+        with benchmark_database():
+            news_ids, sessions = seed_benchmark(
+                options['news'], options['comments'], options['users'],
+                seed=options['seed'],
+            )
+            plans = [
+                make_plan(
+                    generator, options['mix'], options['requests'],
+                    news_ids, sessions,
+                )
+                for _ in range(options['concurrency'])
+            ]
+            results, elapsed = run_load(
+                get_wsgi_application(), plans, 'process'
+            )
+        return summarize(results, elapsed)
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        tuned_pragmas = settings.SQLITE_PRAGMAS
+        report = {}
+        try:
+            settings.SQLITE_PRAGMAS = {}
+            report['default'] = self.run(options)
+            settings.SQLITE_PRAGMAS = tuned_pragmas
+            report['tuned'] = self.run(options)
+        finally:
+            settings.SQLITE_PRAGMAS = tuned_pragmas
+        report['pragmas'] = tuned_pragmas
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,97 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from news.benchmarks import benchmark_database
+from news.cache import comment_thread
+from news.models import News
+from news.seeding import seed_benchmark
+from news.templating import precompile_templates
+
+
+def templates_with(loaders):
+    """TEMPLATES проекта с другим списком загрузчиков."""
+    templates = [dict(engine) for engine in settings.TEMPLATES]
+    templates[0]['OPTIONS'] = {**templates[0]['OPTIONS'], 'loaders': loaders}
+    return templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет отрисовку news/detail.html с лентой из тысячи '
+        'комментариев: шаблоны с диска на каждое обращение, как при '
+        'DEBUG, и кэширующий загрузчик с компиляцией при старте. '
+        'Выводит отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def measure(self, news, repeat):
+        request = RequestFactory().get(f'/news/{news.pk}/')
+        request.user = AnonymousUser()
+        timings = {'thread': [], 'page': []}
+        for _ in range(repeat):
+            # Лента отрисовывается заново: includes/comment.html
+            # загружается для каждого комментария.
+            cache.clear()
+            started = time.perf_counter()
+            comments, next_cursor = comment_thread(news)
+            rendered = time.perf_counter()
+            render_to_string(
+                'news/detail.html',
+                {
+                    'object': news, 'news': news, 'comments': comments,
+                    'next_cursor': next_cursor,
+                },
+                request,
+            )
+            finished = time.perf_counter()
+            timings['thread'].append((rendered - started) * 1000)
+            timings['page'].append((finished - rendered) * 1000)
+        return {
+            part: {
+                'mean': round(statistics.mean(values), 2),
+                'min': round(min(values), 2),
+            }
+            for part, values in timings.items()
+        }
+
+    def handle(self, *args, **options):
+        settings.DEBUG = False
+        profiles = {
+            'uncached': settings.TEMPLATE_LOADERS,
+            'cached': [
+                ('django.template.loaders.cached.Loader',
+                 settings.TEMPLATE_LOADERS),
+            ],
+        }
+        report = {}
+        with benchmark_database(), override_settings(
+            COMMENTS_COUNT_ON_DETAIL_PAGE=options['comments']
+        ):
+            seed_benchmark(1, options['comments'], 20, seed=options['seed'])
+            news = News.objects.get()
+            for name, loaders in profiles.items():
+                with override_settings(TEMPLATES=templates_with(loaders)):
+                    started = time.perf_counter()
+                    compiled = precompile_templates()
+                    report[name] = {
+                        'precompile_ms': round(
+                            (time.perf_counter() - started) * 1000, 2
+                        ),
+                        'templates': compiled,
+                        **self.measure(news, options['repeat']),
+                    }
+        report['comments'] = options['comments']
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
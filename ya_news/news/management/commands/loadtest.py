@@ -0,0 +1,68 @@
+import json
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from news.benchmarks import (
+    benchmark_database, make_plan, parse_mix, run_load, summarize
+)
+from news.seeding import seed_benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон WSGI-приложения на временной базе: '
+        'главная, страница новости, отправка комментария. '
+        'Выводит req/s и p50/p95/p99 по маршрутам в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=200)
+        parser.add_argument('--comments', type=int, default=50,
+                            help='Комментариев на новость.')
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на одного исполнителя.')
+        parser.add_argument('--mode', choices=('thread', 'process'),
+                            default='thread')
+        parser.add_argument(
+            '--mix', type=parse_mix, default='home=50,detail=40,comment=10',
+            help='Доли маршрутов home, detail и comment.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Файл для отчёта JSON.')
+
+    def handle(self, *args, **options):
+        # Отладочный курсор копит все запросы в памяти и искажает замер.
+        settings.DEBUG = False
+        generator = random.Random(options['seed'])
+        with benchmark_database():
+            news_ids, sessions = seed_benchmark(
+                options['news'], options['comments'], options['users'],
+                seed=options['seed'],
+            )
+            plans = [
+                make_plan(
+                    generator, options['mix'], options['requests'],
+                    news_ids, sessions,
+                )
+                for _ in range(options['concurrency'])
+            ]
+            results, elapsed = run_load(
+                get_wsgi_application(), plans, options['mode']
+            )
+        report = summarize(results, elapsed)
+        report['config'] = {
+            key: options[key] for key in (
+                'news', 'comments', 'users', 'concurrency', 'requests',
+                'mode', 'mix', 'seed',
+            )
+        }
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        self.stdout.write(output)
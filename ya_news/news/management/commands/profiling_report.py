@@ -0,0 +1,79 @@
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.middleware import METRICS, percentile
+
+# Верхние границы корзин гистограммы общего времени запроса, мс.
+BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сводка замеров ProfilingMiddleware по всем процессам: '
+        'перцентили и гистограмма времени ответа по представлениям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir', default=settings.REQUEST_PROFILING_DIR,
+            help='Каталог с файлами замеров процессов.',
+        )
+        parser.add_argument(
+            '--json', action='store_true',
+            help='Вывести сводку в JSON.',
+        )
+
+    def load(self, directory):
+        samples = defaultdict(lambda: defaultdict(list))
+        for path in sorted(Path(directory).glob('*.json')):
+            data = json.loads(path.read_text(encoding='utf-8'))
+            for view_name, view in data.items():
+                for metric in METRICS:
+                    samples[view_name][metric].extend(view.get(metric, ()))
+        return samples
+
+    def summarize(self, view):
+        summary = {'requests': len(view['total'])}
+        for metric in METRICS:
+            values = sorted(view[metric])
+            for share in (0.5, 0.95, 0.99):
+                summary[f'{metric}_p{round(share * 100)}'] = round(
+                    percentile(values, share), 2
+                )
+        histogram = dict.fromkeys([*map(str, BUCKETS), 'inf'], 0)
+        for value in view['total']:
+            bucket = next(
+                (str(bound) for bound in BUCKETS if value <= bound), 'inf'
+            )
+            histogram[bucket] += 1
+        summary['histogram'] = histogram
+        return summary
+
+    def handle(self, *args, **options):
+        report = {
+            view_name: self.summarize(view)
+            for view_name, view in sorted(self.load(options['dir']).items())
+        }
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if not report:
+            self.stdout.write('Замеров нет.')
+            return
+        for view_name, summary in report.items():
+            self.stdout.write(
+                f'{view_name}: {summary["requests"]} запросов, '
+                f'total p50/p95/p99 {summary["total_p50"]}/'
+                f'{summary["total_p95"]}/{summary["total_p99"]} мс, '
+                f'sql p95 {summary["sql_p95"]} мс '
+                f'({summary["sql_count_p95"]} запросов), '
+                f'render p95 {summary["render_p95"]} мс'
+            )
+            total = summary['requests']
+            for bucket, count in summary['histogram'].items():
+                bar = '#' * round(40 * count / total)
+                self.stdout.write(f'  <= {bucket:>5} мс {count:>7} {bar}')
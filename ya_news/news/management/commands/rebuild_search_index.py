@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from news.search import fts_available, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый индекс новостей и комментариев.'
+
+    def handle(self, *args, **options):
+        if not fts_available():
+            raise CommandError(
+                'Полнотекстового индекса нет: поиск работает без него.'
+            )
+        rebuild_index()
+        self.stdout.write('Индекс перестроен.')
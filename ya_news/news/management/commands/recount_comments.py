@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from news.models import Comment, News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у всех новостей.'
+
+    def handle(self, *args, **options):
+        """Обновляем счётчики одним запросом UPDATE с подзапросом."""
+        comments = Comment.objects.filter(
+            news=OuterRef('pk')
+        ).order_by().values('news').annotate(
+            count=Count('pk')
+        ).values('count')
+        updated = News.objects.update(
+            comment_count=Coalesce(Subquery(comments), 0)
+        )
+        self.stdout.write(f'Обновлено новостей: {updated}')
@@ -0,0 +1,44 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from news.seeding import BATCH_SIZE, seed_news
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу пользователями, новостями и комментариями '
+        'для замеров на больших объёмах. Данные пишутся пачками, '
+        'память не растёт с числом строк. Выводит отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--news', type=int, default=10000)
+        parser.add_argument('--comments', type=float, default=20,
+                            help='Среднее число комментариев на новость.')
+        parser.add_argument('--days', type=int, default=3650,
+                            help='За сколько дней публикуются новости.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['news'], options['comments']) < 0:
+            raise CommandError('Объёмы не могут быть отрицательными.')
+        if options['days'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--days и --batch-size должны быть больше 0.')
+        if options['comments'] and not options['users']:
+            raise CommandError('Комментариям нужны авторы: задайте --users.')
+        # Отладочный курсор копит все запросы вместе с огромными
+        # INSERT в памяти.
+        settings.DEBUG = False
+        started = time.perf_counter()
+        report = seed_news(
+            options['news'], options['comments'], options['users'],
+            days=options['days'], seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        report['seconds'] = round(time.perf_counter() - started, 2)
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
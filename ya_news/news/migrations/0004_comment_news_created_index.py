@@ -0,0 +1,21 @@
+# Generated by Django 3.2.15 on 2026-10-18 05:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='comment',
+            options={'ordering': ('created', 'id')},
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['news', 'created', 'id'], name='comment_news_created_idx'),
+        ),
+    ]
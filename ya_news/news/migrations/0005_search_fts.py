@@ -0,0 +1,84 @@
+# Generated by Django 3.2.15 on 2026-10-18 05:47
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# Внешнее содержимое (content=...) не дублирует тексты в индексе.
+# Триггеры на UPDATE срабатывают только при изменении индексируемых
+# колонок: обновление счётчика комментариев новость не переиндексирует.
+CREATE_FTS = (
+    "CREATE VIRTUAL TABLE news_news_fts USING fts5("
+    "title, text, content='news_news', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE VIRTUAL TABLE news_comment_fts USING fts5("
+    "text, content='news_comment', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER news_news_fts_insert AFTER INSERT ON news_news BEGIN "
+    "INSERT INTO news_news_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER news_news_fts_delete AFTER DELETE ON news_news BEGIN "
+    "INSERT INTO news_news_fts(news_news_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    "CREATE TRIGGER news_news_fts_update AFTER UPDATE OF title, text "
+    "ON news_news BEGIN "
+    "INSERT INTO news_news_fts(news_news_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    "INSERT INTO news_news_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER news_comment_fts_insert AFTER INSERT ON news_comment "
+    "BEGIN INSERT INTO news_comment_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "CREATE TRIGGER news_comment_fts_delete AFTER DELETE ON news_comment "
+    "BEGIN INSERT INTO news_comment_fts(news_comment_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER news_comment_fts_update AFTER UPDATE OF text "
+    "ON news_comment BEGIN "
+    "INSERT INTO news_comment_fts(news_comment_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO news_comment_fts(rowid, text) "
+    "VALUES (new.id, new.text); END",
+    "INSERT INTO news_news_fts(news_news_fts) VALUES ('rebuild')",
+    "INSERT INTO news_comment_fts(news_comment_fts) VALUES ('rebuild')",
+)
+DROP_FTS = (
+    'DROP TRIGGER IF EXISTS news_news_fts_insert',
+    'DROP TRIGGER IF EXISTS news_news_fts_delete',
+    'DROP TRIGGER IF EXISTS news_news_fts_update',
+    'DROP TRIGGER IF EXISTS news_comment_fts_insert',
+    'DROP TRIGGER IF EXISTS news_comment_fts_delete',
+    'DROP TRIGGER IF EXISTS news_comment_fts_update',
+    'DROP TABLE IF EXISTS news_news_fts',
+    'DROP TABLE IF EXISTS news_comment_fts',
+)
+
+
+def create_fts(apps, schema_editor):
+    """Индекс FTS5 есть только у SQLite, собранной с этим модулем."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_FTS[0])
+        except OperationalError:
+            return
+        for statement in CREATE_FTS[1:]:
+            cursor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_FTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_comment_news_created_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
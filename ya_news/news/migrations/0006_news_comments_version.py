@@ -0,0 +1,56 @@
+# Generated by Django 3.2.15 on 2026-10-18 06:23
+
+from django.db import migrations, models
+
+# SQLite добавляет колонку, пересоздавая таблицу news_news, и вместе
+# со старой таблицей удаляются триггеры индекса FTS из миграции 0005.
+# Их нужно создать заново и после добавления колонки, и после её
+# удаления при откате.
+CREATE_NEWS_TRIGGERS = (
+    "CREATE TRIGGER IF NOT EXISTS news_news_fts_insert AFTER INSERT "
+    "ON news_news BEGIN "
+    "INSERT INTO news_news_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS news_news_fts_delete AFTER DELETE "
+    "ON news_news BEGIN "
+    "INSERT INTO news_news_fts(news_news_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    "CREATE TRIGGER IF NOT EXISTS news_news_fts_update "
+    "AFTER UPDATE OF title, text ON news_news BEGIN "
+    "INSERT INTO news_news_fts(news_news_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    "INSERT INTO news_news_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+)
+
+
+def restore_news_triggers(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    if 'news_news_fts' not in connection.introspection.table_names():
+        return
+    with connection.cursor() as cursor:
+        for statement in CREATE_NEWS_TRIGGERS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_search_fts'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            migrations.RunPython.noop, restore_news_triggers
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='comments_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            restore_news_triggers, migrations.RunPython.noop
+        ),
+    ]
@@ -8,9 +8,16 @@ class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    # Растёт при каждой записи в ленту комментариев. Ключ закэшированной
+    # ленты строится по ней, поэтому все процессы видят одну версию.
+    comments_version = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
-        ordering = ('-date',)
+        ordering = ('-date', '-id')
+        indexes = (
+            models.Index(fields=('-date', '-id'), name='news_date_id_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
@@ -31,7 +38,13 @@ class Comment(models.Model):
     created = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        ordering = ('created',)
+        ordering = ('created', 'id')
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
@@ -0,0 +1,76 @@
+"""
+Поиск запрещённых слов в комментариях.
+
+Список слов один раз собирается в префиксное дерево, а дерево — в одно
+регулярное выражение. В каждой позиции текста движок проверяет только
+ветку дерева, начинающуюся с текущего символа, поэтому время проверки
+почти не зависит от длины списка, в отличие от перебора
+`word in text` по каждому слову.
+"""
+import re
+from pathlib import Path
+
+_END = None
+
+
+def load_words(path):
+    """
+    Читает список слов из файла: по одному слову в строке.
+
+    Пустые строки и строки, начинающиеся с #, пропускаются.
+    """
+    if not path:
+        return ()
+    lines = Path(path).read_text(encoding='utf-8').splitlines()
+    return tuple(
+        line.strip() for line in lines
+        if line.strip() and not line.lstrip().startswith('#')
+    )
+
+
+def _build_trie(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            if _END in node:
+                # Более короткое слово уже найдёт любое совпадение.
+                break
+            node = node.setdefault(char, {})
+        else:
+            node.clear()
+            node[_END] = True
+    return trie
+
+
+def _trie_pattern(node):
+    if _END in node:
+        return ''
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+    ]
+    if len(branches) == 1:
+        return branches[0]
+    return '(?:' + '|'.join(branches) + ')'
+
+
+class WordMatcher:
+    """Ищет в тексте любое из заданных слов за один проход."""
+
+    def __init__(self, words):
+        self.words = tuple(
+            {word.strip().lower() for word in words if word.strip()}
+        )
+        trie = _build_trie(self.words)
+        self.pattern = re.compile(_trie_pattern(trie)) if trie else None
+
+    def __len__(self):
+        return len(self.words)
+
+    def search(self, text):
+        """Первое найденное в тексте слово или None."""
+        if self.pattern is None:
+            return None
+        match = self.pattern.search(text.lower())
+        return match.group() if match else None
@@ -0,0 +1,100 @@
+"""
+Постраничный вывод по ключу (keyset, он же seek pagination).
+
+Вместо OFFSET следующая страница выбирается условием «строго после
+последней записи предыдущей страницы» по полям сортировки, поэтому
+стоимость запроса не зависит от глубины листания. Положение в выдаче
+передаётся в URL непрозрачным курсором.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+# Целые за пределами знакового 64-битного числа база не сравнит:
+# SQLite поднимает OverflowError уже при выполнении запроса.
+MAX_INTEGER = 2 ** 63 - 1
+
+
+def _field_name(field):
+    return field.lstrip('-')
+
+
+def encode_cursor(obj, fields):
+    """Курсор, указывающий на позицию сразу после объекта obj."""
+    values = [str(getattr(obj, _field_name(field))) for field in fields]
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, model, fields):
+    """
+    Разбирает курсор в значения полей сортировки.
+
+    Для испорченного или чужого курсора поднимает ValueError.
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Некорректный курсор.')
+    if not isinstance(values, list) or len(values) != len(fields):
+        raise ValueError('Некорректный курсор.')
+    # encode_cursor пишет только строки: числа, списки и null
+    # в курсоре подделаны.
+    if not all(isinstance(value, str) for value in values):
+        raise ValueError('Некорректный курсор.')
+    try:
+        values = [
+            model._meta.get_field(_field_name(field)).to_python(value)
+            for field, value in zip(fields, values)
+        ]
+    except (ValidationError, TypeError, OverflowError):
+        raise ValueError('Некорректный курсор.')
+    if any(
+        isinstance(value, int) and abs(value) > MAX_INTEGER
+        for value in values
+    ):
+        raise ValueError('Некорректный курсор.')
+    return values
+
+
+def seek_filter(fields, values):
+    """
+    Условие «после позиции values» для сортировки fields.
+
+    Для ('-date', '-id') получается
+    date <= d AND (date < d OR (date = d AND id < i)),
+    первое слагаемое позволяет базе пройти по составному индексу.
+    """
+    first = _field_name(fields[0])
+    first_lookup = 'lte' if fields[0].startswith('-') else 'gte'
+    condition = Q()
+    for index, field in enumerate(fields):
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        equal = {
+            _field_name(previous): value
+            for previous, value in zip(fields[:index], values)
+        }
+        equal[f'{_field_name(field)}__{lookup}'] = values[index]
+        condition |= Q(**equal)
+    return Q(**{f'{first}__{first_lookup}': values[0]}) & condition
+
+
+def paginate(queryset, fields, cursor=None, size=10):
+    """
+    Возвращает страницу объектов и курсор следующей страницы.
+
+    Если следующей страницы нет, вместо курсора возвращается None.
+    """
+    queryset = queryset.order_by(*fields)
+    if cursor:
+        values = decode_cursor(cursor, queryset.model, fields)
+        queryset = queryset.filter(seek_filter(fields, values))
+    objects = list(queryset[:size + 1])
+    next_cursor = None
+    if len(objects) > size:
+        objects = objects[:size]
+        next_cursor = encode_cursor(objects[-1], fields)
+    return objects, next_cursor
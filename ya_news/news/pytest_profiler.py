@@ -0,0 +1,224 @@
+"""
+Профилировщик тестов для pytest.
+
+Для каждого теста записывает время выполнения, время подготовки
+фикстур (всего и по каждой фикстуре) и число SQL-запросов по фазам
+setup, call и teardown. Включается опцией --profile-report=путь.json:
+отчёт пишется в JSON, а рядом, с расширением .html, — таблица для
+просмотра в браузере. Самые медленные тесты выводятся в конце прогона.
+
+Бюджет времени (--test-time-budget или test_time_budget в pytest.ini,
+в секундах) проверяется по фазе call: тест, который шёл дольше, падает,
+так что замедление видно в том коммите, который его внёс.
+
+Под pytest-xdist замеры едут в контроллер вместе с отчётами о тестах,
+и файлы отчёта пишет только он.
+"""
+import html
+import json
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.db import connections
+
+SLOWEST_IN_SUMMARY = 10
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('profiling', 'профилирование тестов')
+    group.addoption(
+        '--profile-report', metavar='PATH',
+        help='Записать замеры тестов в JSON по этому пути и в HTML рядом.',
+    )
+    group.addoption(
+        '--test-time-budget', type=float, metavar='SECONDS',
+        help='Ронять тесты, которые выполнялись дольше, 0 — без бюджета.',
+    )
+    parser.addini(
+        'test_time_budget', default='0',
+        help='Бюджет времени фазы call одного теста, в секундах.',
+    )
+
+
+def pytest_configure(config):
+    budget = config.getoption('test_time_budget')
+    if budget is None:
+        budget = float(config.getini('test_time_budget'))
+    report_path = config.getoption('profile_report')
+    if report_path or budget:
+        config.pluginmanager.register(
+            Profiler(report_path, budget), 'test-profiler'
+        )
+
+
+class Profiler:
+
+    def __init__(self, report_path, budget):
+        self.report_path = report_path
+        self.budget = budget
+        self.results = []
+        self.current = None
+        self.phase = None
+
+    def count_query(self, execute, sql, params, many, context):
+        self.current['sql'][self.phase] += 1
+        return execute(sql, params, many, context)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item):
+        self.current = {
+            'durations': {},
+            'fixtures': defaultdict(float),
+            'sql': defaultdict(int),
+            'outcome': 'passed',
+        }
+        yield
+        self.current = None
+
+    def _run_phase(self, phase):
+        self.phase = phase
+        # Без настроек Django (pytest -p no:django) запросы не считаем.
+        tracked = connections.all() if settings.configured else ()
+        with ExitStack() as stack:
+            for connection in tracked:
+                stack.enter_context(
+                    connection.execute_wrapper(self.count_query)
+                )
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        yield from self._run_phase('setup')
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._run_phase('call')
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._run_phase('teardown')
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        # Зависимости из сигнатуры фикстуры готовятся до этого хука,
+        # так что здесь время её собственного кода.
+        started = time.perf_counter()
+        yield
+        if self.current is not None:
+            self.current['fixtures'][fixturedef.argname] += (
+                time.perf_counter() - started
+            )
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        if self.current is None:
+            return
+        if (
+            report.when == 'call' and report.passed
+            and self.budget and report.duration > self.budget
+        ):
+            report.outcome = 'failed'
+            report.longrepr = (
+                f'Тест выполнялся {report.duration:.3f} с '
+                f'при бюджете {self.budget:.3f} с.'
+            )
+        self.current['durations'][report.when] = report.duration
+        if report.failed:
+            self.current['outcome'] = 'failed'
+        elif report.skipped and self.current['outcome'] == 'passed':
+            self.current['outcome'] = 'skipped'
+        if report.when == 'teardown':
+            report.test_profile = {
+                'durations': self.current['durations'],
+                'fixtures': dict(self.current['fixtures']),
+                'sql': dict(self.current['sql']),
+                'outcome': self.current['outcome'],
+            }
+
+    def pytest_runtest_logreport(self, report):
+        profile = getattr(report, 'test_profile', None)
+        if profile is None:
+            return
+        durations = profile['durations']
+        self.results.append({
+            'nodeid': report.nodeid,
+            'outcome': profile['outcome'],
+            'call': round(durations.get('call', 0), 4),
+            'setup': round(durations.get('setup', 0), 4),
+            'teardown': round(durations.get('teardown', 0), 4),
+            'sql': profile['sql'],
+            'fixtures': {
+                name: round(seconds, 4)
+                for name, seconds in sorted(
+                    profile['fixtures'].items(),
+                    key=lambda item: item[1], reverse=True,
+                )
+            },
+        })
+
+    def pytest_sessionfinish(self, session):
+        if hasattr(session.config, 'workerinput') or not self.report_path:
+            return
+        self.results.sort(
+            key=lambda result: result['call'] + result['setup'], reverse=True
+        )
+        report = {'budget': self.budget, 'tests': self.results}
+        path = Path(self.report_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(report, indent=2, ensure_ascii=False), 'utf-8'
+        )
+        path.with_suffix('.html').write_text(
+            render_html(self.results, self.budget), 'utf-8'
+        )
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.report_path or not self.results:
+            return
+        terminalreporter.section('самые медленные тесты')
+        slowest = sorted(
+            self.results, key=lambda result: result['call'], reverse=True
+        )[:SLOWEST_IN_SUMMARY]
+        for result in slowest:
+            terminalreporter.write_line(
+                f'{result["call"]:8.3f} с  setup {result["setup"]:.3f} с  '
+                f'SQL {sum(result["sql"].values()):>4}  {result["nodeid"]}'
+            )
+
+
+def render_html(results, budget):
+    rows = []
+    for result in results:
+        fixtures = ', '.join(
+            f'{name} {seconds:.3f}'
+            for name, seconds in result['fixtures'].items()
+        )
+        sql = result['sql']
+        rows.append(
+            '<tr>'
+            f'<td>{html.escape(result["nodeid"])}</td>'
+            f'<td>{result["outcome"]}</td>'
+            f'<td>{result["call"]:.3f}</td>'
+            f'<td>{result["setup"]:.3f}</td>'
+            f'<td>{sql.get("setup", 0)}/{sql.get("call", 0)}/'
+            f'{sql.get("teardown", 0)}</td>'
+            f'<td>{html.escape(fixtures)}</td>'
+            '</tr>'
+        )
+    return (
+        '<!DOCTYPE html>\n<html lang="ru"><head><meta charset="utf-8">'
+        '<title>Профиль тестов</title></head><body>'
+        f'<h1>Профиль тестов</h1><p>Тестов: {len(results)}, '
+        f'бюджет: {budget or "нет"} с.</p>'
+        '<table border="1"><tr><th>Тест</th><th>Итог</th><th>call, с</th>'
+        '<th>setup, с</th><th>SQL setup/call/teardown</th>'
+        '<th>Фикстуры, с</th></tr>'
+        + '\n'.join(rows)
+        + '</table></body></html>\n'
+    )
@@ -1,12 +1,65 @@
+import copy
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 
 import pytest
 from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from django.test.client import Client
 from django.urls import reverse
 
 from news.models import News, Comment
 
+User = get_user_model()
+
+
+@pytest.fixture(scope='session')
+def shared_data(django_db_setup, django_db_blocker):
+    """
+    Пользователи, их сессии и новость — одни на все тесты.
+
+    Записи создаются один раз сразу после тестовой базы. Каждый тест
+    идёт в транзакции, которая откатывается, поэтому его изменения
+    этих записей не видны другим тестам.
+    """
+    with django_db_blocker.unblock():
+        data = SimpleNamespace(
+            author=User.objects.create(username='автор'),
+            not_author=User.objects.create(username='не автор'),
+            news=News.objects.create(
+                title='Заголовок',
+                text='Текст новости',
+            ),
+            sessions={},
+        )
+        for user in (data.author, data.not_author):
+            client = Client()
+            client.force_login(user)
+            data.sessions[user.pk] = (
+                client.cookies[settings.SESSION_COOKIE_NAME].value
+            )
+    return data
+
+
+def logged_in_client(shared_data, user):
+    """Клиент с готовой сессией пользователя: без входа на каждый тест."""
+    client = Client()
+    client.cookies[settings.SESSION_COOKIE_NAME] = (
+        shared_data.sessions[user.pk]
+    )
+    return client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кэш не должен переживать тест: id в тестовой базе повторяются."""
+    for backend in caches.all():
+        backend.clear()
+    yield
+    for backend in caches.all():
+        backend.clear()
+
 
 @pytest.fixture
 def anonim():
@@ -14,37 +67,31 @@ def anonim():
     return client
 
 
+# Тесты получают копии общих объектов: правки полей в одном тесте
+# не должны попадать в другие.
 @pytest.fixture
-def author(django_user_model):
-    return django_user_model.objects.create(username='автор')
+def author(db, shared_data):
+    return copy.copy(shared_data.author)
 
 
 @pytest.fixture
-def not_author(django_user_model):
-    return django_user_model.objects.create(username='не автор')
+def not_author(db, shared_data):
+    return copy.copy(shared_data.not_author)
 
 
 @pytest.fixture
-def author_client(author):
-    client = Client()
-    client.force_login(author)
-    return client
+def author_client(shared_data, author):
+    return logged_in_client(shared_data, author)
 
 
 @pytest.fixture
-def not_author_client(not_author):
-    client = Client()
-    client.force_login(not_author)
-    return client
+def not_author_client(shared_data, not_author):
+    return logged_in_client(shared_data, not_author)
 
 
 @pytest.fixture
-def news():
-    news = News.objects.create(
-        title='Заголовок',
-        text='Текст новости',
-    )
-    return news
+def news(db, shared_data):
+    return copy.copy(shared_data.news)
 
 
 @pytest.fixture
@@ -54,6 +101,8 @@ def comment(author, news):
         author=author,
         text='Текст комментария'
     )
+    news.comment_count += 1
+    news.save()
     return comment
 
 
@@ -71,10 +120,12 @@ def page_data():
 
 @pytest.fixture
 def comment_data(news, author):
-    for index in range(10):
-        Comment.objects.create(
-            news=news, author=author, text=f'Tекст {index}',
-        )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Tекст {index}')
+        for index in range(10)
+    )
+    news.comment_count += 10
+    news.save()
 
 
 @pytest.fixture
@@ -82,11 +133,26 @@ def home_url():
     return reverse('news:home')
 
 
+@pytest.fixture
+def archive_url():
+    return reverse('news:archive')
+
+
+@pytest.fixture
+def search_url():
+    return f"{reverse('news:search')}?q=текст"
+
+
 @pytest.fixture
 def detail_url(news):
     return reverse('news:detail', args=(news.pk,))
 
 
+@pytest.fixture
+def comments_url(news):
+    return reverse('news:comments', args=(news.pk,))
+
+
 @pytest.fixture
 def delete_url(comment):
     return reverse('news:delete', args=(comment.id,))
@@ -1,7 +1,16 @@
+import re
+from http import HTTPStatus
+from io import StringIO
+
 import pytest
 from django.conf import settings
+from django.core.cache import caches
+from django.core.management import call_command
+from django.urls import reverse
 
+from news.cache import bump_comments_version
 from news.forms import CommentForm
+from news.models import Comment, News
 
 
 pytestmark = pytest.mark.django_db
@@ -27,6 +36,85 @@ def test_news_order(client, home_url):
     assert sorted_dates == all_dates
 
 
+def test_home_page_shows_comment_count(client, comment_data, home_url):
+    """На главной странице выводится счётчик комментариев новости."""
+    response = client.get(home_url)
+    news = response.context['object_list'][0]
+    assert news.comment_count == 10
+    assert 'Комментариев: 10' in response.content.decode()
+
+
+def test_archive_pages(client, page_data, archive_url):
+    """
+    Архив листается курсором: страницы не пересекаются,
+    идут от свежих новостей к старым и вместе содержат все новости.
+    """
+    first_page = client.get(archive_url)
+    first_news = list(first_page.context['object_list'])
+    assert len(first_news) == settings.NEWS_COUNT_ON_HOME_PAGE
+    cursor = first_page.context['next_cursor']
+    assert cursor is not None
+    second_page = client.get(archive_url, {'cursor': cursor})
+    second_news = list(second_page.context['object_list'])
+    assert second_page.context['next_cursor'] is None
+    all_news = first_news + second_news
+    assert [news.pk for news in all_news] == list(
+        News.objects.order_by('-date', '-id').values_list('pk', flat=True)
+    )
+
+
+@pytest.mark.parametrize(
+    'query, found',
+    (
+        ('ЗАГОЛОВ', True),
+        ('новости текст', True),
+        ('комментария', True),
+        ('редиска', False),
+        ('\x00', False),
+        ('ЗАГОЛОВ\x00', True),
+    )
+)
+def test_search(client, comment, query, found):
+    """Поиск находит новость по заголовку, тексту и комментариям."""
+    response = client.get(reverse('news:search'), {'q': query})
+    object_list = response.context['object_list']
+    assert (list(object_list) == [comment.news]) is found
+
+
+def test_search_ranks_title_above_comments(client, comment, author):
+    """Совпадение в заголовке новости важнее совпадения в комментарии."""
+    news = News.objects.create(title='Комментария нет', text='Текст')
+    response = client.get(reverse('news:search'), {'q': 'комментария'})
+    assert list(response.context['object_list']) == [news, comment.news]
+
+
+def test_search_prefers_whole_words(client):
+    """Совпадения целых слов выводятся раньше совпадений по началу."""
+    prefix = News.objects.create(title='Кодекс', text='Текст')
+    whole = News.objects.create(title='Код', text='Текст')
+    response = client.get(reverse('news:search'), {'q': 'код'})
+    assert list(response.context['object_list']) == [whole, prefix]
+
+
+def test_search_ranks_only_recent_candidates(client, settings):
+    """Ранжируются только NEWS_SEARCH_CANDIDATES свежих совпадений."""
+    settings.NEWS_SEARCH_CANDIDATES = 1
+    News.objects.create(title='Робот', text='Текст')
+    recent = News.objects.create(title='Новость', text='Робот')
+    response = client.get(reverse('news:search'), {'q': 'робот'})
+    assert list(response.context['object_list']) == [recent]
+
+
+def test_search_index_follows_edits(author_client, comment, edit_url):
+    """После правки комментария поиск находит новый текст."""
+    author_client.post(edit_url, data={'text': 'Совсем другое'})
+    response = author_client.get(reverse('news:search'), {'q': 'другое'})
+    assert list(response.context['object_list']) == [comment.news]
+    call_command('rebuild_search_index', stdout=StringIO())
+    response = author_client.get(reverse('news:search'), {'q': 'другое'})
+    assert list(response.context['object_list']) == [comment.news]
+
+
 def test_comments_order(client, detail_url):
     """
     Комментарии на странице отдельной новости отсортированы в
@@ -41,6 +129,71 @@ def test_comments_order(client, detail_url):
     assert all_timestamps == sorted_timestamps
 
 
+def test_comment_thread_refreshes_after_writes(
+        author_client, comment, detail_url, edit_url
+):
+    """
+    Закэшированная лента комментариев обновляется после
+    добавления и редактирования комментария.
+    """
+    author_client.get(detail_url)
+    author_client.post(detail_url, data={'text': 'Новый комментарий'})
+    author_client.post(edit_url, data={'text': 'Исправленный текст'})
+    content = author_client.get(detail_url).content.decode()
+    assert 'Новый комментарий' in content
+    assert 'Исправленный текст' in content
+    assert comment.text not in content
+
+
+def test_comment_thread_version_in_database(author_client, comment, news,
+                                            detail_url):
+    """
+    Версия ленты хранится в базе: запись из другого процесса, который
+    не трогал здешний кэш, сбрасывает закэшированную ленту.
+    """
+    author_client.get(detail_url)
+    Comment.objects.filter(pk=comment.pk).update(text='Из другого процесса')
+    bump_comments_version(news.pk)
+    news.refresh_from_db()
+    assert news.comments_version == 1
+    content = author_client.get(detail_url).content.decode()
+    assert 'Из другого процесса' in content
+
+
+def test_comment_links_only_for_author(author_client, not_author_client,
+                                       detail_url, edit_url):
+    """
+    Ссылки на редактирование и удаление выводятся только автору,
+    хотя лента комментариев берётся из общего кэша.
+    """
+    response = author_client.get(detail_url)
+    assert edit_url in response.content.decode()
+    response = not_author_client.get(detail_url)
+    assert edit_url not in response.content.decode()
+
+
+def test_comments_are_paginated(client, settings, comment_data,
+                                detail_url, comments_url):
+    """
+    На странице новости выводится первая страница комментариев,
+    остальные подгружаются по курсору в JSON по порядку и без повторов.
+    """
+    settings.COMMENTS_COUNT_ON_DETAIL_PAGE = 4
+    response = client.get(detail_url)
+    first_page = response.context['comments']
+    assert len(first_page) == settings.COMMENTS_COUNT_ON_DETAIL_PAGE
+    loaded = [comment.pk for comment in first_page]
+    next_cursor = response.context['next_cursor']
+    while next_cursor:
+        page = client.get(comments_url, {'cursor': next_cursor}).json()
+        loaded += [
+            int(pk) for pk in re.findall(r'id="comment-(\d+)"', page['html'])
+        ]
+        next_cursor = page['next_cursor']
+    news = response.context['news']
+    assert loaded == list(news.comment_set.values_list('pk', flat=True))
+
+
 def test_anonymous_client_has_no_form(client, detail_url):
     """
     Анонимному пользователю недоступна форма для отправки комментария
@@ -58,3 +211,104 @@ def test_authorized_client_has_form(not_author_client, detail_url):
     response = not_author_client.get(detail_url)
     assert 'form' in response.context
     assert isinstance(response.context['form'], CommentForm)
+
+
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_unchanged_page_is_not_modified(author_client, url):
+    """Неизменившаяся страница отдаётся ответом 304 по ETag."""
+    etag = author_client.get(url)['ETag']
+    response = author_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response['ETag'] == etag
+
+
+def test_etag_depends_on_user(client, author_client, detail_url):
+    """Страницы анонима и пользователя с формой различаются по ETag."""
+    assert client.get(detail_url)['ETag'] != (
+        author_client.get(detail_url)['ETag']
+    )
+
+
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_page_changes_after_new_comment(author_client, url, detail_url):
+    """После нового комментария страница снова отдаётся целиком."""
+    etag = author_client.get(url)['ETag']
+    author_client.post(detail_url, data={'text': 'Новый комментарий'})
+    response = author_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != etag
+
+
+def test_anonymous_page_is_cached(
+        client, news, home_url, django_assert_num_queries
+):
+    """
+    Повторный запрос анонима отдаётся из кэша страниц: к базе идёт
+    только запрос версии страницы.
+    """
+    content = client.get(home_url).content
+    with django_assert_num_queries(1):
+        response = client.get(home_url)
+    assert response.content == content
+
+
+def test_page_cache_ignores_unknown_params(
+        client, news, home_url, detail_url, django_assert_num_queries
+):
+    """
+    Посторонние параметры запроса не создают новых копий страницы,
+    а курсор ленты комментариев создаёт.
+    """
+    client.get(home_url)
+    client.get(detail_url)
+    with django_assert_num_queries(2):
+        client.get(home_url, {'x': 1})
+        client.get(detail_url, {'x': 2})
+    cursor = client.get(detail_url, {'cursor': 'испорчен'})
+    assert cursor.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_page_cache_invalidated_by_comment(
+        client, author_client, url, detail_url
+):
+    """После нового комментария аноним видит обновлённую страницу."""
+    before = client.get(url).content
+    author_client.post(detail_url, data={'text': 'Новый комментарий'})
+    assert client.get(url).content != before
+
+
+@pytest.mark.parametrize(
+    'url', (pytest.lazy_fixture('home_url'), pytest.lazy_fixture('detail_url'))
+)
+def test_page_cache_sees_writes_of_other_processes(client, news, url):
+    """
+    Правка новости в обход представлений, как из другого процесса,
+    сразу видна анониму: версия страницы берётся из базы.
+    """
+    client.get(url)
+    News.objects.filter(pk=news.pk).update(title='Другой заголовок')
+    assert 'Другой заголовок' in client.get(url).content.decode()
+
+
+def test_stale_page_served_while_rebuilding(
+        client, author_client, monkeypatch, home_url, detail_url
+):
+    """
+    Пока устаревшую страницу перестраивает другой запрос,
+    аноним получает прежнюю копию.
+    """
+    before = client.get(home_url).content
+    author_client.post(detail_url, data={'text': 'Новый комментарий'})
+    page_cache = caches[settings.NEWS_PAGE_CACHE]
+    with monkeypatch.context() as patch:
+        # Блокировку перестройки держит другой запрос.
+        patch.setattr(page_cache, 'add', lambda *args, **kwargs: False)
+        assert client.get(home_url).content == before
+    assert client.get(home_url).content != before
@@ -0,0 +1,27 @@
+import pytest
+from django.db import connection
+
+from news.db import check_connections
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_sqlite_pragmas():
+    """PRAGMA из настроек применяются к каждому соединению."""
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA synchronous')
+        # NORMAL.
+        assert cursor.fetchone()[0] == 1
+        cursor.execute('PRAGMA busy_timeout')
+        assert cursor.fetchone()[0] == 5000
+
+
+def test_health_check_closes_broken_connection(monkeypatch):
+    """Перед запросом неработающее постоянное соединение закрывается."""
+    connection.ensure_connection()
+    closed = []
+    monkeypatch.setattr(connection, 'is_usable', lambda: False)
+    monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+    check_connections()
+    assert closed
@@ -1,10 +1,12 @@
 from http import HTTPStatus
 
 import pytest
+from django.core.management import call_command
 from pytest_django.asserts import assertRedirects, assertFormError
 
-from news.models import Comment
+from news.models import Comment, News
 from news.forms import BAD_WORDS, WARNING
+from news.moderation import WordMatcher, load_words
 
 
 pytestmark = pytest.mark.django_db
@@ -30,6 +32,8 @@ def test_user_can_create_comment(author, author_client, news, detail_url):
     assert comment.text == comment_text
     assert comment.news == news
     assert comment.author == author
+    news.refresh_from_db()
+    assert news.comment_count == 1
 
 
 def test_user_cant_use_bad_words(author_client, news, detail_url):
@@ -50,6 +54,16 @@ def test_user_cant_use_bad_words(author_client, news, detail_url):
     assert comments_count == comments_count_before
 
 
+def test_rejected_comment_keeps_thread(author_client, comment, detail_url):
+    """Страница с ошибкой формы выводит ленту комментариев."""
+    response = author_client.post(detail_url, data={'text': BAD_WORDS[0]})
+    assert response.status_code == HTTPStatus.OK
+    assert [item.pk for item in response.context['comments']] == [
+        comment.pk
+    ]
+    assert comment.text in response.content.decode()
+
+
 def test_author_can_delete_comment(author_client, comment,
                                    delete_url, detail_url):
     """Авторизованный пользователь может удалять свои комментарии."""
@@ -59,6 +73,8 @@ def test_author_can_delete_comment(author_client, comment,
     assertRedirects(response, url_to_comments)
     comments_count = Comment.objects.count()
     assert comments_count == comments_count_before - 1
+    news = News.objects.get()
+    assert news.comment_count == 0
 
 
 def test_user_cant_delete_comment_of_another_user(not_author_client,
@@ -101,3 +117,32 @@ def test_user_cant_edit_comment_of_another_user(not_author_client,
     assert edited_comment.news == comment.news
     assert edited_comment.author == comment.author
     assert edited_comment.created == comment.created
+
+
+def test_recount_comments_command(news, comment_data):
+    """Команда recount_comments восстанавливает счётчики комментариев."""
+    News.objects.update(comment_count=0)
+    call_command('recount_comments')
+    news.refresh_from_db()
+    assert news.comment_count == news.comment_set.count()
+
+
+@pytest.mark.parametrize(
+    'text, found',
+    (
+        ('Ну ты и РЕДИСКА!', 'редиска'),
+        ('редисками не ругаются', 'редиска'),
+        ('Отличная новость, спасибо', None),
+    )
+)
+def test_word_matcher(text, found):
+    """Проверка находит слова без учёта регистра и внутри других слов."""
+    matcher = WordMatcher(('негодяй', 'Редиска'))
+    assert matcher.search(text) == found
+
+
+def test_load_bad_words_from_file(tmp_path):
+    """Список слов читается из файла без пустых строк и комментариев."""
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('# словарь\nредиска\n\n негодяй \n', 'utf-8')
+    assert load_words(words_file) == ('редиска', 'негодяй')
@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.template.response import SimpleTemplateResponse
+from django.test.client import Client
+
+from news.middleware import store
+
+
+pytestmark = pytest.mark.django_db
+
+SAMPLE = (
+    'import time\n\n\n'
+    'def test_fast():\n    pass\n\n\n'
+    'def test_slow():\n    time.sleep(0.3)\n'
+)
+
+
+def test_profiling_middleware(settings, tmp_path, news, detail_url):
+    """
+    Профилировщик отдаёт замеры в Server-Timing, а команда
+    profiling_report собирает их из файлов процессов.
+    """
+    settings.REQUEST_PROFILING = True
+    store.clear()
+    response = Client().get(detail_url)
+    assert 'sql;dur=' in response['Server-Timing']
+    store.dump(tmp_path)
+    output = StringIO()
+    call_command('profiling_report', dir=tmp_path, json=True, stdout=output)
+    report = json.loads(output.getvalue())
+    assert report['news:detail']['requests'] == 1
+    assert report['news:detail']['sql_count_p50'] > 0
+
+
+def test_profiling_cached_page_render(settings, monkeypatch, news,
+                                      detail_url):
+    """
+    Время отрисовки страницы анонима попадает в профиль, хотя её
+    отрисовывает кэш страниц прямо в представлении.
+    """
+    settings.REQUEST_PROFILING = True
+    store.clear()
+    rendered_content = SimpleTemplateResponse.rendered_content
+
+    def slow_rendered_content(response):
+        time.sleep(0.05)
+        return rendered_content.fget(response)
+
+    monkeypatch.setattr(
+        SimpleTemplateResponse, 'rendered_content',
+        property(slow_rendered_content),
+    )
+    Client().get(detail_url)
+    assert store.snapshot()['news:detail']['render'][0] >= 50
+
+
+def test_test_profiler(settings, tmp_path):
+    """
+    Профилировщик пишет отчёт со временем тестов и роняет тест,
+    превысивший бюджет.
+    """
+    (tmp_path / 'test_sample.py').write_text(SAMPLE, 'utf-8')
+    report = tmp_path / 'profile.json'
+    result = subprocess.run(
+        [
+            sys.executable, '-m', 'pytest', '-p', 'no:django',
+            '-p', 'news.pytest_profiler', '-p', 'no:cacheprovider',
+            '--test-time-budget=0.2', f'--profile-report={report}',
+        ],
+        cwd=tmp_path, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONPATH': str(settings.BASE_DIR)},
+    )
+    assert result.returncode == 1
+    assert 'при бюджете 0.200 с' in result.stdout
+    tests = json.loads(report.read_text('utf-8'))['tests']
+    assert tests[0]['nodeid'].endswith('test_slow')
+    assert tests[0]['outcome'] == 'failed'
+    assert tests[0]['call'] >= 0.3
+    assert report.with_suffix('.html').exists()
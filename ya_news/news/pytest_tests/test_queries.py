@@ -0,0 +1,124 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from news.search import fts_available
+from news.urls import app_name, urlpatterns
+from yanews.urls import auth_urls
+
+
+pytestmark = pytest.mark.django_db
+
+# Загрузка сессии и пользователя при каждом запросе авторизованного клиента.
+AUTH_QUERIES = 2
+# SAVEPOINT и RELEASE SAVEPOINT вокруг записи: тест сам идёт в транзакции.
+ATOMIC_QUERIES = 2
+
+
+def test_create_comment_queries(author_client, news, detail_url,
+                                django_assert_num_queries):
+    """
+    Создание комментария: новость, вставка комментария
+    и увеличение счётчика.
+    """
+    with django_assert_num_queries(AUTH_QUERIES + ATOMIC_QUERIES + 3):
+        response = author_client.post(detail_url, data={'text': 'Текст'})
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_edit_comment_queries(author_client, edit_url,
+                              django_assert_num_queries):
+    """
+    Редактирование комментария: комментарий, его обновление
+    и версия ленты.
+    """
+    with django_assert_num_queries(AUTH_QUERIES + ATOMIC_QUERIES + 3):
+        response = author_client.post(edit_url, data={'text': 'Текст'})
+    assert response.status_code == HTTPStatus.FOUND
+
+
+def test_delete_comment_queries(author_client, delete_url,
+                                django_assert_num_queries):
+    """
+    Удаление комментария: комментарий, его удаление
+    и уменьшение счётчика.
+    """
+    with django_assert_num_queries(AUTH_QUERIES + ATOMIC_QUERIES + 3):
+        response = author_client.delete(delete_url)
+    assert response.status_code == HTTPStatus.FOUND
+
+
+# Сколько SQL-запросов может сделать GET-запрос к странице
+# для клиентов (аноним, автор комментария, не автор).
+# Главная и страница новости для анонима начинаются с запроса версии
+# закэшированной страницы.
+QUERY_BUDGETS = {
+    'news:home': (2, 3, 3),
+    'news:archive': (1, 3, 3),
+    # Целых слов меньше страницы: второй запрос ищет по началу слов.
+    'news:search': (3, 5, 5),
+    'news:detail': (3, 4, 4),
+    'news:comments': (2, 4, 4),
+    'news:edit': (0, 3, 3),
+    'news:delete': (0, 3, 3),
+    'users:login': (0, 2, 2),
+    'users:logout': (0, 4, 4),
+    'users:signup': (0, 2, 2),
+}
+CLIENTS = (
+    pytest.lazy_fixture('anonim'),
+    pytest.lazy_fixture('author_client'),
+    pytest.lazy_fixture('not_author_client'),
+)
+
+
+@pytest.fixture
+def urls_by_name(home_url, archive_url, search_url, detail_url, comments_url,
+                 edit_url, delete_url, login_url, logout_url, signup_url):
+    return {
+        'news:home': home_url,
+        'news:archive': archive_url,
+        'news:search': search_url,
+        'news:detail': detail_url,
+        'news:comments': comments_url,
+        'news:edit': edit_url,
+        'news:delete': delete_url,
+        'users:login': login_url,
+        'users:logout': logout_url,
+        'users:signup': signup_url,
+    }
+
+
+def test_query_budgets_cover_all_urls():
+    """В таблице бюджетов есть все страницы проекта."""
+    url_names = {
+        f'{app_name}:{pattern.name}' for pattern in urlpatterns
+    } | {
+        f'{auth_urls[1]}:{pattern.name}' for pattern in auth_urls[0]
+    }
+    assert url_names == set(QUERY_BUDGETS)
+
+
+@pytest.mark.parametrize('url_name', QUERY_BUDGETS)
+@pytest.mark.parametrize(
+    'client, client_index', zip(CLIENTS, range(len(CLIENTS))),
+    ids=('anonim', 'author', 'not_author'),
+)
+def test_query_budget(url_name, client, client_index, urls_by_name,
+                      comment_data):
+    """Страницы не выходят за бюджет SQL-запросов."""
+    budget = QUERY_BUDGETS[url_name][client_index]
+    # Наличие индексов FTS проверяется раз на соединение, а не на запрос.
+    fts_available()
+    with CaptureQueriesContext(connection) as context:
+        client.get(urls_by_name[url_name])
+    if len(context) > budget:
+        queries = '\n\n'.join(
+            query['sql'] for query in context.captured_queries
+        )
+        pytest.fail(
+            f'{url_name}: {len(context)} SQL-запросов '
+            f'при бюджете {budget}:\n\n{queries}'
+        )
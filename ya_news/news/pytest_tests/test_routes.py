@@ -1,6 +1,10 @@
+import base64
+import json
 from http import HTTPStatus
 
 import pytest
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
 from django.urls import reverse
 from pytest_django.asserts import assertRedirects
 
@@ -9,10 +13,13 @@ pytestmark = pytest.mark.django_db
 
 
 HOME_URL = pytest.lazy_fixture('home_url')
+ARCHIVE_URL = pytest.lazy_fixture('archive_url')
+SEARCH_URL = pytest.lazy_fixture('search_url')
 LOGIN_URL = pytest.lazy_fixture('login_url')
 LOGOUT_URL = pytest.lazy_fixture('logout_url')
 SIGNUP_URL = pytest.lazy_fixture('signup_url')
 DETAIL_URL = pytest.lazy_fixture('detail_url')
+COMMENTS_URL = pytest.lazy_fixture('comments_url')
 EDIT_URL = pytest.lazy_fixture('edit_url')
 DELETE_URL = pytest.lazy_fixture('delete_url')
 
@@ -21,14 +28,35 @@ NOT_AUTHOR_CLIENT = pytest.lazy_fixture('not_author_client')
 AUTHOR_CLIENT = pytest.lazy_fixture('author_client')
 
 
+def forge_cursor(values):
+    raw = json.dumps(values).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+# Курсоры, которые читаются, но не могли быть выданы сайтом.
+FORGED_CURSORS = tuple(
+    forge_cursor(values)
+    for values in (
+        [1, 2],
+        ['2020-01-01', None],
+        ['2020-01-01', ['1']],
+        ['2020-01-01', '9' * 30],
+        ['2020-01-01', str(-2 ** 63 - 1)],
+    )
+)
+
+
 @pytest.mark.parametrize(
     'url, client, status',
     (
         (HOME_URL, ANONIM_CLIENT, HTTPStatus.OK),
+        (ARCHIVE_URL, ANONIM_CLIENT, HTTPStatus.OK),
+        (SEARCH_URL, ANONIM_CLIENT, HTTPStatus.OK),
         (LOGIN_URL, ANONIM_CLIENT, HTTPStatus.OK),
         (LOGOUT_URL, ANONIM_CLIENT, HTTPStatus.OK),
         (SIGNUP_URL, ANONIM_CLIENT, HTTPStatus.OK),
         (DETAIL_URL, ANONIM_CLIENT, HTTPStatus.OK),
+        (COMMENTS_URL, ANONIM_CLIENT, HTTPStatus.OK),
         (EDIT_URL, NOT_AUTHOR_CLIENT, HTTPStatus.NOT_FOUND),
         (DELETE_URL, NOT_AUTHOR_CLIENT, HTTPStatus.NOT_FOUND),
         (EDIT_URL, AUTHOR_CLIENT, HTTPStatus.OK),
@@ -65,3 +93,40 @@ def test_redirects(client, url):
     expected_url = f'{login_url}?next={url}'
     response = client.get(url)
     assertRedirects(response, expected_url)
+
+
+def test_archive_with_broken_cursor(client, archive_url):
+    """Архив с испорченным курсором отвечает ошибкой 404."""
+    response = client.get(archive_url, {'cursor': 'не-курсор'})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('cursor', FORGED_CURSORS)
+def test_archive_with_forged_cursor(client, archive_url, cursor):
+    """Архив с подделанным, но читаемым курсором отвечает ошибкой 404."""
+    response = client.get(archive_url, {'cursor': cursor})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.parametrize('url', (DETAIL_URL, COMMENTS_URL))
+@pytest.mark.parametrize('cursor', ('не-курсор', *FORGED_CURSORS))
+def test_comments_with_forged_cursor(client, url, cursor, comment):
+    """Лента комментариев с чужим курсором отвечает ошибкой 404."""
+    response = client.get(url, {'cursor': cursor})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.urls('yanews.urls_asgi')
+@pytest.mark.parametrize('url', (HOME_URL, DETAIL_URL))
+def test_async_pages_availability(url, author_client):
+    """Асинхронные страницы ASGI доступны и анониму, и автору."""
+    async def get(client):
+        return await client.get(url)
+
+    # Потоки пула читают базу своими соединениями и видят только
+    # общие данные тестов: сессию автора берём у author_client.
+    anonymous, client = AsyncClient(), AsyncClient()
+    client.cookies = author_client.cookies
+    for async_client in (anonymous, client):
+        response = async_to_sync(get)(async_client)
+        assert response.status_code == HTTPStatus.OK
@@ -0,0 +1,68 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+from news.models import News
+from news.seeding import seed_benchmark, seed_news
+
+
+pytestmark = pytest.mark.django_db
+
+
+def test_seed_command():
+    """
+    Команда seed создаёт данные пачками, счётчики комментариев
+    сходятся, а комментарии не старше своих новостей.
+    """
+    news_before = News.objects.count()
+    output = StringIO()
+    call_command('seed', users=3, news=20, comments=3, batch_size=7,
+                 stdout=output)
+    report = json.loads(output.getvalue())
+    assert report['users'] == 3
+    assert report['news'] == 20
+    seeded = News.objects.order_by('-pk')[:20].annotate(
+        comments=Count('comment')
+    )
+    assert News.objects.count() == news_before + 20
+    assert sum(news.comments for news in seeded) == report['comments']
+    for news in seeded:
+        assert news.comment_count == news.comments
+        for comment in news.comment_set.all():
+            assert timezone.localdate(comment.created) >= news.date
+
+
+def test_seed_is_deterministic():
+    """Один и тот же seed даёт одни и те же данные."""
+    def seeded():
+        return list(
+            News.objects.order_by('-pk')[:10].values_list(
+                'title', 'date', 'comment_count'
+            )
+        )
+
+    seed_news(10, 2, 2, seed=5)
+    first = seeded()
+    seed_news(10, 2, 2, seed=5)
+    assert seeded() == first
+
+
+def test_seed_benchmark(client):
+    """
+    Данные для замеров: у новостей ровно заданное число комментариев,
+    а cookies сессий открывают сайт от имени созданных пользователей.
+    """
+    news_ids, sessions = seed_benchmark(3, 2, 2)
+    counts = News.objects.filter(pk__in=news_ids).annotate(
+        comments=Count('comment')
+    ).values_list('comment_count', 'comments')
+    assert list(counts) == [(2, 2)] * 3
+    assert len(sessions) == 2
+    client.cookies['sessionid'] = sessions[0]['sessionid']
+    response = client.get(reverse('news:detail', args=(news_ids[0],)))
+    assert response.context['user'].is_authenticated
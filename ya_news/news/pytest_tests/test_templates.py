@@ -0,0 +1,31 @@
+import runpy
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from news.templating import precompile_templates
+
+
+def test_precompile_templates(settings):
+    """При старте компилируются все шаблоны проекта."""
+    assert precompile_templates() == len(
+        list((settings.BASE_DIR / 'templates').rglob('*.html'))
+    )
+
+
+def test_templates_cached_independent_of_debug(settings):
+    """Загрузчик шаблонов выбирается TEMPLATES_CACHED, а не DEBUG."""
+    project = runpy.run_path(str(settings.BASE_DIR / 'yanews' / 'settings.py'))
+    loader, _ = project['TEMPLATES'][0]['OPTIONS']['loaders'][0]
+    assert project['TEMPLATES_CACHED']
+    assert loader == 'django.template.loaders.cached.Loader'
+
+
+def test_precompile_fails_on_broken_template(settings, tmp_path):
+    """Ошибка в шаблоне останавливает запуск с именем шаблона."""
+    (tmp_path / 'broken.html').write_text('{% if %}', 'utf-8')
+    settings.TEMPLATES = [
+        {**settings.TEMPLATES[0], 'DIRS': [tmp_path]},
+    ]
+    with pytest.raises(ImproperlyConfigured, match='broken.html'):
+        precompile_templates()
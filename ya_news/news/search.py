@@ -0,0 +1,121 @@
+"""
+Поиск по новостям и комментариям.
+
+На SQLite используются полнотекстовые индексы FTS5 news_news_fts
+и news_comment_fts, которые миграция 0005 создаёт и поддерживает
+триггерами. Совпадения ранжируются по bm25: заголовок весит больше
+текста, совпадение в комментарии — меньше совпадения в самой новости.
+Если индексов нет, поиск идёт через icontains, свежие новости первыми.
+
+Считать bm25 для каждого совпадения — секунды на миллионах строк,
+поэтому из каждого индекса берутся только NEWS_SEARCH_CANDIDATES самых
+свежих совпадений: FTS5 отдаёт их в порядке rowid без ранжирования,
+и bm25 считается лишь для них. Слова сначала ищутся целиком; поиск
+по началу слова, которому приходится сливать списки всех слов с таким
+началом, идёт, только если целых слов не хватило на страницу.
+"""
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+
+from .models import News
+
+FTS_TABLES = ('news_news_fts', 'news_comment_fts')
+
+# Весовые коэффициенты bm25 для колонок title и text новости
+# и множитель ранга для совпадений в комментариях.
+TITLE_WEIGHT = 5.0
+TEXT_WEIGHT = 1.0
+COMMENT_FACTOR = 0.5
+
+SEARCH_SQL = f'''
+    SELECT news_id FROM (
+        SELECT * FROM (
+            SELECT rowid AS news_id,
+                   bm25(news_news_fts, {TITLE_WEIGHT}, {TEXT_WEIGHT}) AS rank
+            FROM news_news_fts WHERE news_news_fts MATCH %s
+            ORDER BY rowid DESC LIMIT %s
+        )
+        UNION ALL
+        SELECT comment.news_id, hits.rank FROM (
+            SELECT rowid, bm25(news_comment_fts) * {COMMENT_FACTOR} AS rank
+            FROM news_comment_fts WHERE news_comment_fts MATCH %s
+            ORDER BY rowid DESC LIMIT %s
+        ) AS hits
+        JOIN news_comment AS comment ON comment.id = hits.rowid
+    )
+    GROUP BY news_id
+    ORDER BY MIN(rank)
+    LIMIT %s
+'''
+
+
+def fts_available(using='default'):
+    """Есть ли в базе полнотекстовые индексы новостей."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    if not hasattr(connection, 'news_fts_available'):
+        tables = connection.introspection.table_names()
+        connection.news_fts_available = all(
+            table in tables for table in FTS_TABLES
+        )
+    return connection.news_fts_available
+
+
+def fts_query(query, prefix=True):
+    """
+    Запрос FTS5 из пользовательской строки.
+
+    Каждое слово берётся в кавычки, чтобы символы синтаксиса FTS5
+    не ломали запрос, и, если prefix, ищется по началу; слова
+    объединяются через И. Непечатаемые символы считаются пробелами:
+    NUL в запросе SQLite отвергает с ошибкой. Если слов не осталось,
+    возвращается ''.
+    """
+    query = ''.join(char if char.isprintable() else ' ' for char in query)
+    template = '"{}"*' if prefix else '"{}"'
+    return ' '.join(
+        template.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+def _search_fts(match, limit):
+    candidates = settings.NEWS_SEARCH_CANDIDATES
+    with connections['default'].cursor() as cursor:
+        cursor.execute(
+            SEARCH_SQL, (match, candidates, match, candidates, limit)
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_news(query, limit):
+    """Новости, подходящие под запрос, от самых релевантных."""
+    if not fts_available():
+        return list(News.objects.filter(
+            Q(title__icontains=query)
+            | Q(text__icontains=query)
+            | Q(comment__text__icontains=query)
+        ).distinct()[:limit])
+    match = fts_query(query, prefix=False)
+    if not match:
+        return []
+    ids = _search_fts(match, limit)
+    if len(ids) < limit:
+        # Совпадения целых слов остаются первыми.
+        found = set(ids)
+        ids += [
+            pk for pk in _search_fts(fts_query(query), limit + len(ids))
+            if pk not in found
+        ][:limit - len(ids)]
+    news = News.objects.in_bulk(ids)
+    return [news[pk] for pk in ids if pk in news]
+
+
+def rebuild_index():
+    """Перестраивает индексы по текущему содержимому таблиц."""
+    with connections['default'].cursor() as cursor:
+        for table in FTS_TABLES:
+            cursor.execute(
+                f"INSERT INTO {table}({table}) VALUES ('rebuild')"
+            )
@@ -0,0 +1,196 @@
+"""
+Генерация больших объёмов данных для замеров.
+
+Пользователи, новости и комментарии создаются потоком: генераторы
+выдают объекты, которые пачками по batch_size сохраняются через
+bulk_create, каждая пачка в своей транзакции. В памяти одновременно
+только одна пачка, поэтому объём ограничен лишь местом на диске.
+
+Первичные ключи назначаются заранее, следом за уже занятыми: SQLite
+в Django 3.2 не возвращает id из bulk_create, а комментариям нужны
+id новостей и пользователей. При одинаковом seed на пустой базе
+данные получаются одинаковыми.
+"""
+import random
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.test.client import Client
+from django.utils import timezone
+
+from .benchmarks import random_text
+from .models import Comment, News
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+
+SECONDS_IN_DAY = 24 * 60 * 60
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def save_in_batches(model, objects, batch_size=BATCH_SIZE):
+    """Сохраняет поток объектов пачками; возвращает их число."""
+    saved = 0
+    for chunk in chunked(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(chunk)
+        saved += len(chunk)
+    return saved
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+@contextmanager
+def explicit_created():
+    """
+    Позволяет задать Comment.created при bulk_create.
+
+    Иначе auto_now_add заменит дату каждого комментария текущим
+    временем.
+    """
+    field = Comment._meta.get_field('created')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def news_age(generator, days):
+    """
+    Возраст новости в днях.
+
+    Распределение экспоненциальное со средним в четверть срока:
+    свежих новостей намного больше, чем старых.
+    """
+    return min(int(generator.expovariate(4 / days)), days - 1)
+
+
+def comment_delay(generator, age):
+    """
+    Через сколько секунд после публикации написан комментарий.
+
+    Большинство комментариев появляется в первые сутки, но не позже
+    текущего момента.
+    """
+    limit = (age + 1) * SECONDS_IN_DAY
+    return min(generator.expovariate(1 / SECONDS_IN_DAY), limit - 1)
+
+
+def generate_users(first_pk, count, prefix='user'):
+    password = make_password(None)
+    for pk in range(first_pk, first_pk + count):
+        yield User(pk=pk, username=f'{prefix}{pk}', password=password)
+
+
+def seed_news(news_count, comments_per_news, user_count, days=3650,
+              seed=0, batch_size=BATCH_SIZE, fixed_comments=False):
+    """
+    Наполняет базу пользователями, новостями и комментариями.
+
+    comments_per_news — среднее число комментариев на новость, а при
+    fixed_comments — точное. Возвращает словарь с числом созданных
+    объектов каждого вида.
+    """
+    generator = random.Random(seed)
+    first_user = next_pk(User)
+    users = save_in_batches(
+        User, generate_users(first_user, user_count), batch_size
+    )
+    first_news = next_pk(News)
+    today = timezone.localdate()
+
+    def news_plan():
+        # Возраст и число комментариев каждой новости. План нужен
+        # дважды, для новостей и для комментариев, и не хранится,
+        # а порождается заново из того же seed.
+        plan_generator = random.Random(seed)
+        for index in range(news_count):
+            age = news_age(plan_generator, days)
+            if fixed_comments or not comments_per_news:
+                comment_count = int(comments_per_news)
+            else:
+                comment_count = int(
+                    plan_generator.expovariate(1 / comments_per_news)
+                )
+            yield first_news + index, age, comment_count
+
+    news = save_in_batches(
+        News,
+        (
+            News(
+                pk=pk,
+                title=random_text(generator, 4)[:50],
+                text=random_text(generator, 60),
+                date=today - timedelta(days=age),
+                comment_count=comment_count,
+            )
+            for pk, age, comment_count in news_plan()
+        ),
+        batch_size,
+    )
+    now = timezone.now()
+
+    def generate_comments():
+        for news_pk, age, comment_count in news_plan():
+            published = timezone.make_aware(
+                datetime.combine(today - timedelta(days=age), time())
+            )
+            for _ in range(comment_count):
+                created = published + timedelta(
+                    seconds=comment_delay(generator, age)
+                )
+                yield Comment(
+                    news_id=news_pk,
+                    author_id=first_user + generator.randrange(user_count),
+                    text=random_text(generator, 20),
+                    created=min(created, now),
+                )
+
+    with explicit_created():
+        comments = save_in_batches(Comment, generate_comments(), batch_size)
+    return {'users': users, 'news': news, 'comments': comments}
+
+
+def session_cookies(users):
+    """Cookies сессий, в которых пользователи users уже вошли на сайт."""
+    cookies = []
+    for user in users:
+        client = Client()
+        client.force_login(user)
+        cookies.append({'sessionid': client.cookies['sessionid'].value})
+    return cookies
+
+
+def seed_benchmark(news_count, comments_per_news, user_count, seed=0):
+    """
+    Наполняет базу для нагрузочного замера.
+
+    У каждой новости ровно comments_per_news комментариев. Возвращает
+    id созданных новостей и cookies сессий созданных пользователей.
+    """
+    first_user, first_news = next_pk(User), next_pk(News)
+    seed_news(
+        news_count, comments_per_news, user_count, seed=seed,
+        fixed_comments=True,
+    )
+    news_ids = list(range(first_news, first_news + news_count))
+    return news_ids, session_cookies(
+        User.objects.filter(pk__gte=first_user).order_by('pk')
+    )
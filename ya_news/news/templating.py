@@ -0,0 +1,39 @@
+"""
+Предварительная компиляция шаблонов.
+
+С кэширующим загрузчиком шаблон читается и разбирается один раз,
+при первом обращении. precompile_templates() делает это для всех
+шаблонов проекта при старте воркера, так что первые запросы не платят
+за разбор, а ошибка в шаблоне останавливает запуск, а не всплывает
+в ответе 500. Без кэширующего загрузчика (TEMPLATES_CACHED = False)
+разобранные шаблоны не сохраняются, и остаётся только проверка.
+"""
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+
+def precompile_templates():
+    """
+    Компилирует все шаблоны из DIRS движков DjangoTemplates.
+
+    Возвращает число шаблонов. При ошибке в шаблоне поднимает
+    ImproperlyConfigured с его именем.
+    """
+    count = 0
+    for engine in engines.all():
+        if not isinstance(engine, DjangoTemplates):
+            continue
+        for directory in map(Path, engine.engine.dirs):
+            for path in sorted(directory.rglob('*.html')):
+                name = path.relative_to(directory).as_posix()
+                try:
+                    engine.get_template(name)
+                except TemplateSyntaxError as error:
+                    raise ImproperlyConfigured(
+                        f'Ошибка в шаблоне {name}: {error}'
+                    ) from error
+                count += 1
+    return count
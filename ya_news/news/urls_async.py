@@ -0,0 +1,21 @@
+"""
+Маршруты новостей для ASGI.
+
+Те же, что в news.urls, но главная и страница новости обслуживаются
+асинхронными представлениями.
+"""
+from django.urls import path
+
+from news import views
+from news.urls import app_name, urlpatterns as sync_urlpatterns  # noqa: F401
+
+ASYNC_VIEWS = {
+    'home': views.news_list,
+    'detail': views.news_detail,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS[pattern.name], name=pattern.name)
+    if pattern.name in ASYNC_VIEWS else pattern
+    for pattern in sync_urlpatterns
+]
@@ -1,14 +1,108 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.http import Http404, JsonResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag, urlencode
 from django.views import generic
 
+from .cache import (
+    bump_comments_version, cached_page, comment_thread, page_version,
+)
+from .db import check_connections
 from .forms import CommentForm
+from .middleware import render_response
 from .models import Comment, News
+from .pagination import paginate
+from .search import search_news
+
+
+class ConditionalGetMixin:
+    """
+    Условный GET по ETag.
+
+    ETag считается по данным, которые страница уже загрузила, и по
+    пользователю, чьё имя выводится в шапке.
+    Если клиент прислал совпадающий If-None-Match, вместо отрисовки
+    шаблона отдаётся 304.
+    """
+
+    def get_etag_data(self):
+        """Данные страницы, от которых зависит её содержимое."""
+        raise NotImplementedError
+
+    def get_etag(self):
+        user = self.request.user
+        data = (
+            self.get_etag_data(),
+            user.pk,
+            user.get_username(),
+        )
+        return quote_etag(hashlib.md5(repr(data).encode()).hexdigest())
+
+    def render_to_response(self, context, **response_kwargs):
+        etag = self.get_etag()
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            response = super().render_to_response(context, **response_kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class AnonymousPageCacheMixin:
+    """
+    Страница целиком из кэша для анонимов.
 
+    Анонимы видят одну и ту же страницу, поэтому её достаточно
+    отрисовать один раз на версию из get_page_version(). Ключ кэша —
+    путь и только те параметры запроса, которые читает представление
+    (page_cache_params): посторонние параметры не плодят копии.
+    """
+    page_cache_params = ()
 
-class NewsList(generic.ListView):
+    def get_page_version(self):
+        raise NotImplementedError
+
+    def get_page_cache_key(self):
+        params = urlencode([
+            (name, self.request.GET[name])
+            for name in self.page_cache_params if name in self.request.GET
+        ])
+        return f'{self.request.path}?{params}'
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+
+        def render():
+            return render_response(
+                request,
+                super(AnonymousPageCacheMixin, self).dispatch(
+                    request, *args, **kwargs
+                ),
+            )
+
+        response = cached_page(
+            self.get_page_cache_key(), self.get_page_version(), render
+        )
+        not_modified = get_conditional_response(
+            request, etag=response.get('ETag'), response=response
+        )
+        return not_modified or response
+
+
+class NewsList(
+        AnonymousPageCacheMixin, ConditionalGetMixin, generic.ListView
+):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
@@ -19,20 +113,91 @@ class NewsList(generic.ListView):
 
         Их количество определяется в настройках проекта.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
-        )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+        return self.model.objects.all()[:settings.NEWS_COUNT_ON_HOME_PAGE]
+
+    def get_page_version(self):
+        return page_version()
+
+    def get_etag_data(self):
+        # Тот же список, что выведет шаблон: запрос выполняется один раз.
+        return [
+            (news.pk, news.title, news.text, news.date, news.comment_count)
+            for news in self.object_list
+        ]
+
+
+class NewsArchive(generic.ListView):
+    """
+    Архив новостей.
+
+    Листается курсором по (date, id), поэтому любая страница архива
+    обходится базе так же дёшево, как первая.
+    """
+    model = News
+    template_name = 'news/archive.html'
+    ordering = ('-date', '-id')
+
+    def get_queryset(self):
+        try:
+            news, self.next_cursor = paginate(
+                self.model.objects.all(),
+                self.ordering,
+                cursor=self.request.GET.get('cursor'),
+                size=settings.NEWS_COUNT_ON_HOME_PAGE,
+            )
+        except ValueError:
+            raise Http404('Страница архива не найдена.')
+        return news
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = self.next_cursor
+        return context
+
+
+class NewsSearch(generic.ListView):
+    """Поиск по новостям и комментариям к ним."""
+    template_name = 'news/search.html'
+
+    def get_queryset(self):
+        self.query = self.request.GET.get('q', '').strip()
+        if not self.query:
+            return []
+        return search_news(self.query, settings.NEWS_SEARCH_RESULTS)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        return context
+
+
+class CommentThreadMixin:
+    """Страница ленты комментариев новости self.object в контексте."""
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        try:
+            context['comments'], context['next_cursor'] = comment_thread(
+                self.object, self.request.GET.get('cursor')
+            )
+        except ValueError:
+            raise Http404('Страница комментариев не найдена.')
+        return context
 
 
-class NewsDetail(generic.DetailView):
+class NewsDetail(
+        AnonymousPageCacheMixin, ConditionalGetMixin, CommentThreadMixin,
+        generic.DetailView
+):
     model = News
     template_name = 'news/detail.html'
+    page_cache_params = ('cursor',)
+
+    def get_page_version(self):
+        return page_version(self.kwargs['pk'])
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
+        obj = get_object_or_404(self.model, pk=self.kwargs['pk'])
         return obj
 
     def get_context_data(self, **kwargs):
@@ -41,9 +206,44 @@ class NewsDetail(generic.DetailView):
             context['form'] = CommentForm()
         return context
 
+    def get_etag_data(self):
+        news = self.object
+        csrf_secret = None
+        if self.request.user.is_authenticated:
+            # Токен формы выдаётся до проверки ETag, иначе первый ответ
+            # с новой cookie CSRF не совпал бы со следующими.
+            get_token(self.request)
+            csrf_secret = self.request.META['CSRF_COOKIE']
+        # Версия ленты меняется при любом изменении комментариев.
+        return (
+            news.pk, news.title, news.text, news.date, news.comment_count,
+            news.comments_version, self.request.GET.get('cursor'),
+            csrf_secret,
+        )
+
+
+class NewsComments(generic.View):
+    """Следующая страница комментариев новости для «Показать ещё»."""
+
+    def get(self, request, pk):
+        news = get_object_or_404(
+            News.objects.only('pk', 'comments_version'), pk=pk
+        )
+        try:
+            comments, next_cursor = comment_thread(
+                news, request.GET.get('cursor')
+            )
+        except ValueError:
+            raise Http404('Страница комментариев не найдена.')
+        html = render_to_string(
+            'includes/comments.html', {'comments': comments}, request
+        )
+        return JsonResponse({'html': html, 'next_cursor': next_cursor})
+
 
 class NewsComment(
         LoginRequiredMixin,
+        CommentThreadMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
 ):
@@ -59,12 +259,17 @@ class NewsComment(
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        with transaction.atomic():
+            comment.save()
+            bump_comments_version(
+                self.object.pk, comment_count=F('comment_count') + 1
+            )
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
 
 
 class NewsDetailView(generic.View):
@@ -83,14 +288,15 @@ class CommentBase(LoginRequiredMixin):
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
         """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        return self.model.objects.select_related('news').filter(
+            author=self.request.user
+        )
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
@@ -98,7 +304,69 @@ class CommentUpdate(CommentBase, generic.UpdateView):
     template_name = 'news/edit.html'
     form_class = CommentForm
 
+    def form_valid(self, form):
+        with transaction.atomic():
+            response = super().form_valid(form)
+            bump_comments_version(self.object.news_id)
+        return response
+
 
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+
+    def delete(self, request, *args, **kwargs):
+        """Удаляем комментарий и уменьшаем счётчик у новости."""
+        with transaction.atomic():
+            response = super().delete(request, *args, **kwargs)
+            bump_comments_version(
+                self.object.news_id,
+                comment_count=Greatest(F('comment_count') - 1, 0),
+            )
+        return response
+
+
+def async_read_view(view):
+    """
+    Асинхронный вариант представления, которое только читает.
+
+    Под ASGI синхронные представления Django выполняет по очереди
+    в одном общем потоке. Здесь представление вместе с отрисовкой
+    шаблона уходит в пул потоков: у каждого потока своё соединение
+    с базой, и запросы не ждут друг друга. Обращаться к ORM прямо
+    из цикла событий в Django 3.2 нельзя, поэтому вся работа с базой,
+    включая ленивые запросы из шаблона, остаётся внутри sync_to_async.
+    """
+    def render(request, *args, **kwargs):
+        # Сигналы запроса приходят в общий поток, а соединения потоков
+        # пула проверяем и закрываем по CONN_MAX_AGE здесь.
+        close_old_connections()
+        check_connections()
+        try:
+            return render_response(request, view(request, *args, **kwargs))
+        finally:
+            close_old_connections()
+
+    render = sync_to_async(render, thread_sensitive=False)
+
+    async def async_view(request, *args, **kwargs):
+        return await render(request, *args, **kwargs)
+
+    return async_view
+
+
+news_list = async_read_view(NewsList.as_view())
+
+_news_detail = async_read_view(NewsDetail.as_view())
+
+
+async def news_detail(request, pk):
+    """
+    Асинхронная страница новости.
+
+    Отправка комментария пишет в базу и выполняется синхронно,
+    в общем потоке, как и прочие синхронные представления.
+    """
+    if request.method == 'POST':
+        return await sync_to_async(NewsComment.as_view())(request, pk=pk)
+    return await _news_detail(request, pk=pk)
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+from news.templating import precompile_templates
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings_asgi')
 
 application = get_asgi_application()
+
+if settings.TEMPLATES_PRECOMPILE:
+    precompile_templates()
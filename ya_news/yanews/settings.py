@@ -21,6 +21,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'news.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -32,12 +33,24 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'yanews.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# Кэширующий загрузчик: шаблон читается с диска и разбирается один раз
+# на процесс, независимо от DEBUG. False — перечитывать шаблоны при
+# каждом обращении, чтобы правки были видны без перезапуска сервера.
+TEMPLATES_CACHED = True
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ] if TEMPLATES_CACHED else TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -48,6 +61,10 @@ TEMPLATES = [
     },
 ]
 
+# Компилировать шаблоны проекта при загрузке WSGI/ASGI-приложения
+# воркером: ошибка в шаблоне не даст воркеру запуститься.
+TEMPLATES_PRECOMPILE = True
+
 WSGI_APPLICATION = 'yanews.wsgi.application'
 
 
@@ -55,9 +72,40 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами до 10 минут; 0 — закрывать
+        # после каждого запроса.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Открывать соединения с базой при загрузке WSGI-приложения воркером.
+DATABASE_WARM_UP = True
+
+# Выполняются при открытии каждого соединения с SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер кэша страниц в КиБ.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Страницы для анонимов. Версии страниц берутся из базы, поэтому
+    # кэш в памяти процесса не отдаёт устаревших копий; общий кэш
+    # (FileBasedCache, DatabaseCache) лишь избавит процессы от отрисовки
+    # каждой страницы заново.
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+}
+
 
 AUTH_PASSWORD_VALIDATORS = []
 
@@ -80,3 +128,31 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_DETAIL_PAGE = 50
+
+NEWS_SEARCH_RESULTS = 20
+# Сколько самых свежих совпадений каждого индекса FTS ранжируется.
+NEWS_SEARCH_CANDIDATES = 1000
+
+# Время жизни закэшированной ленты комментариев, в секундах. Версия
+# ленты хранится в базе, поэтому кэш 'default' может быть своим
+# у каждого процесса.
+COMMENTS_CACHE_TIMEOUT = 60 * 60
+
+# Кэш страниц для анонимов: псевдоним из CACHES, сколько секунд копия
+# свежая, сколько ещё её можно отдавать, пока один запрос её перестраивает,
+# и сколько ждать копии, если её ещё нет.
+NEWS_PAGE_CACHE = 'pages'
+NEWS_PAGE_CACHE_TIMEOUT = 60
+NEWS_PAGE_CACHE_STALE_TIMEOUT = 10 * 60
+NEWS_PAGE_CACHE_LOCK_TIMEOUT = 5
+
+# Файл с дополнительными запрещёнными словами, по одному в строке.
+BAD_WORDS_FILE = None
+
+# Профилирование запросов: Server-Timing и сводка profiling_report.
+REQUEST_PROFILING = False
+REQUEST_PROFILING_DIR = BASE_DIR / 'profiling'
+REQUEST_PROFILING_SAMPLES = 10000
+REQUEST_PROFILING_FLUSH_EVERY = 100
@@ -0,0 +1,4 @@
+"""Настройки для запуска через yanews.asgi."""
+from .settings import *  # noqa: F401,F403
+
+ROOT_URLCONF = 'yanews.urls_asgi'
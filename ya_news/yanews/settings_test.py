@@ -0,0 +1,34 @@
+"""
+Настройки для прогона тестов.
+
+Тестовая база SQLite в памяти, дешёвый хешер паролей, схема
+встроенных приложений без миграций, только нужные тестам middleware
+и кэширующий загрузчик шаблонов.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import DATABASES, MIDDLEWARE, TEMPLATE_LOADERS, TEMPLATES
+
+DEBUG = False
+
+DATABASES['default']['TEST'] = {'NAME': ':memory:'}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Таблицы встроенных приложений создаются по моделям. У news миграции
+# остаются: они создают таблицы и триггеры полнотекстового поиска FTS5.
+MIGRATION_MODULES = {
+    app: None
+    for app in ('admin', 'auth', 'contenttypes', 'sessions')
+}
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.middleware.security.SecurityMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+]
+
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+]
@@ -0,0 +1,10 @@
+"""Корневые маршруты для ASGI: новости подключаются из news.urls_async."""
+from django.urls import include, path
+
+from .urls import urlpatterns as wsgi_urlpatterns
+
+urlpatterns = [
+    path('', include('news.urls_async'))
+    if getattr(pattern, 'app_name', None) == 'news' else pattern
+    for pattern in wsgi_urlpatterns
+]
@@ -9,8 +9,19 @@ https://docs.djangoproject.com/en/3.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
+from news.db import warm_up_connections
+from news.templating import precompile_templates
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
 
 application = get_wsgi_application()
+
+# Модуль загружается в каждом воркере (без --preload у gunicorn),
+# так что соединения открываются в процессе, который их использует.
+if settings.DATABASE_WARM_UP:
+    warm_up_connections()
+if settings.TEMPLATES_PRECOMPILE:
+    precompile_templates()
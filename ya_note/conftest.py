@@ -0,0 +1 @@
+pytest_plugins = ('notes.pytest_profiler',)
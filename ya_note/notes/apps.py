@@ -1,6 +1,14 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+from .db import check_connections, configure_sqlite
 
 
 class NotesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notes'
+
+    def ready(self):
+        connection_created.connect(configure_sqlite)
+        request_started.connect(check_connections)
@@ -0,0 +1,160 @@
+"""
+Общие инструменты нагрузочных замеров.
+
+Замеры идут на отдельной временной базе SQLite, которая создаётся
+и удаляется так же, как тестовая: рабочая база не затрагивается.
+WSGI-приложение вызывается напрямую, без HTTP-сервера, из нескольких
+потоков или процессов.
+"""
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+
+from django.db import connection, connections
+from django.utils.crypto import get_random_string
+
+from .middleware import percentile
+
+# Секрет CSRF в cookie и тот же секрет в заголовке проходят проверку
+# CsrfViewMiddleware так же, как токен из формы.
+CSRF_SECRET = get_random_string(32)
+
+
+@contextmanager
+def benchmark_database():
+    """Временная файловая база на время замера."""
+    directory = tempfile.mkdtemp(prefix='bench-')
+    connection.settings_dict['TEST']['NAME'] = os.path.join(
+        directory, 'bench.sqlite3'
+    )
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connections.close_all()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        # Рядом с базой могут остаться файлы журнала WAL.
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def make_environ(method, path, body=b'', cookies=None):
+    """Окружение WSGI для запроса к приложению."""
+    path, _, query = path.partition('?')
+    cookies = {'csrftoken': CSRF_SECRET, **(cookies or {})}
+    return {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'HTTP_HOST': 'localhost',
+        'HTTP_COOKIE': '; '.join(f'{k}={v}' for k, v in cookies.items()),
+        'HTTP_X_CSRFTOKEN': CSRF_SECRET,
+        'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+
+
+def call_application(application, method, path, body=b'', cookies=None):
+    """Выполняет запрос и возвращает код ответа."""
+    status = []
+    response = application(
+        make_environ(method, path, body, cookies),
+        lambda response_status, headers, exc_info=None: status.append(
+            response_status
+        ),
+    )
+    try:
+        b''.join(response)
+    finally:
+        # Как и сервер, закрываем ответ: это шлёт request_finished.
+        response.close()
+    return int(status[0].split()[0])
+
+
+def _run_plan(application, plan):
+    results = []
+    for route, method, path, body, cookies in plan:
+        started = time.perf_counter()
+        status = call_application(application, method, path, body, cookies)
+        results.append((route, status, time.perf_counter() - started))
+    return results
+
+
+def _run_plan_in_process(plan):
+    # Загружаем WSGI_APPLICATION, как это делает воркер сервера.
+    from django.core.servers.basehttp import get_internal_wsgi_application
+    return _run_plan(get_internal_wsgi_application(), plan)
+
+
+def run_load(application, plans, mode='thread'):
+    """
+    Прогоняет планы запросов параллельно: по потоку или процессу на план.
+
+    План — список (маршрут, метод, путь, тело, cookies). Возвращает
+    результаты (маршрут, код ответа, секунды) и общее время прогона.
+    """
+    connections.close_all()
+    if mode == 'process':
+        executor = ProcessPoolExecutor(
+            len(plans), mp_context=multiprocessing.get_context('fork')
+        )
+        submit = (lambda plan: executor.submit(_run_plan_in_process, plan))
+    else:
+        executor = ThreadPoolExecutor(len(plans))
+        submit = (lambda plan: executor.submit(_run_plan, application, plan))
+    with executor:
+        started = time.perf_counter()
+        futures = [submit(plan) for plan in plans]
+        results = [item for future in futures for item in future.result()]
+        elapsed = time.perf_counter() - started
+    return results, elapsed
+
+
+def summarize(results, elapsed):
+    """Пропускная способность и задержки по маршрутам, в мс."""
+    def stats(items):
+        timings = sorted(seconds * 1000 for _, _, seconds in items)
+        return {
+            'requests': len(items),
+            'errors': sum(1 for _, status, _ in items if status >= 400),
+            'rps': round(len(items) / elapsed, 1),
+            'p50': round(percentile(timings, 0.5), 2),
+            'p95': round(percentile(timings, 0.95), 2),
+            'p99': round(percentile(timings, 0.99), 2),
+        }
+
+    routes = {}
+    for item in results:
+        routes.setdefault(item[0], []).append(item)
+    return {
+        'elapsed': round(elapsed, 3),
+        'total': stats(results),
+        'routes': {route: stats(items) for route, items in routes.items()},
+    }
+
+
+WORDS = (
+    'заметка', 'план', 'покупки', 'идея', 'встреча', 'книга', 'код',
+    'тесты', 'отпуск', 'список', 'python', 'django', 'задача',
+)
+
+
+def random_text(generator, words):
+    return ' '.join(generator.choices(WORDS, k=words))
@@ -1,9 +1,8 @@
-from pytils.translit import slugify
-
 from django import forms
 from django.core.exceptions import ValidationError
 
 from .models import Note
+from .slugs import make_slug
 
 WARNING = ' - такой slug уже существует, придумайте уникальное значение!'
 
@@ -21,7 +20,8 @@ class NoteForm(forms.ModelForm):
         slug = cleaned_data.get('slug')
         if not slug:
             title = cleaned_data.get('title')
-            slug = slugify(title)[:100]
+            max_length = Note._meta.get_field('slug').max_length
+            slug = make_slug(title, max_length)
         if Note.objects.filter(
                 slug=slug
         ).exclude(id=self.instance.pk).exists():
@@ -0,0 +1,132 @@
+"""
+Массовый импорт заметок.
+
+Заметки вставляются пачками через bulk_create. slug для всей пачки
+подбираются заранее: совпадения разводятся суффиксами -2, -3, …,
+а занятость кандидатов проверяется одним запросом slug__in на пачку.
+"""
+from collections import Counter
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_slug
+from django.db import transaction
+
+from .models import Note
+from .slugs import make_slug
+
+BATCH_SIZE = 400
+
+# Основа slug для заголовков, от которых транслитерация ничего
+# не оставляет (например, «!!!»): пустой slug ломает ссылки на заметку.
+FALLBACK_SLUG = 'note'
+
+
+def _with_suffix(base, number, max_length):
+    if number == 1:
+        return base
+    suffix = f'-{number}'
+    return base[:max_length - len(suffix)] + suffix
+
+
+def resolve_slugs(bases, max_length):
+    """
+    Уникальные slug для списка базовых slug.
+
+    Для каждой базы проверяется вдвое больше кандидатов, чем нужно,
+    поэтому почти всегда хватает одного запроса; если все кандидаты
+    заняты, проверяется следующая порция.
+    """
+    slugs = [None] * len(bases)
+    taken = set()
+    next_number = Counter()
+    pending = list(range(len(bases)))
+    while pending:
+        candidates = {}
+        for base, count in Counter(bases[i] for i in pending).items():
+            start = next_number[base] + 1
+            next_number[base] = start + 2 * count - 1
+            candidates[base] = [
+                _with_suffix(base, number, max_length)
+                for number in range(start, next_number[base] + 1)
+            ]
+        taken.update(Note.objects.filter(
+            slug__in=[slug for group in candidates.values() for slug in group]
+        ).values_list('slug', flat=True))
+        free = {
+            base: (slug for slug in group if slug not in taken)
+            for base, group in candidates.items()
+        }
+        unresolved = []
+        for index in pending:
+            slug = next(free[bases[index]], None)
+            if slug is None:
+                unresolved.append(index)
+            else:
+                slugs[index] = slug
+                taken.add(slug)
+        pending = unresolved
+    return slugs
+
+
+def validate_row(row):
+    """
+    Проверяет строку импорта.
+
+    Строка — словарь, title, text и slug, если заданы, — строки,
+    заголовок не длиннее поля модели. slug должен быть корректным
+    адресом: иначе ссылка на заметку не строится.
+    """
+    if not isinstance(row, dict):
+        raise ValidationError('Заметка должна быть объектом JSON.')
+    for key in ('title', 'text', 'slug'):
+        value = row.get(key)
+        if value is not None and not isinstance(value, str):
+            raise ValidationError(f'{key} должен быть строкой.')
+    title_length = Note._meta.get_field('title').max_length
+    if len(row.get('title') or '') > title_length:
+        raise ValidationError(
+            f'Заголовок длиннее {title_length} символов.'
+        )
+    slug = row.get('slug')
+    if slug:
+        validate_slug(slug)
+
+
+def import_notes(author, rows, batch_size=BATCH_SIZE):
+    """
+    Создаёт заметки автора из словарей с ключами title, text и slug.
+
+    slug необязателен: пустой или отсутствующий строится из заголовка.
+    Некорректная строка вызывает ValidationError.
+    Возвращает число созданных заметок.
+    """
+    title_field = Note._meta.get_field('title')
+    max_length = Note._meta.get_field('slug').max_length
+    rows = iter(rows)
+    created = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return created
+        for row in batch:
+            validate_row(row)
+        notes = [
+            Note(
+                title=row.get('title') or title_field.get_default(),
+                text=row.get('text') or '',
+                author=author,
+            )
+            for row in batch
+        ]
+        bases = [
+            (row.get('slug') or '')[:max_length]
+            or make_slug(note.title, max_length)
+            or FALLBACK_SLUG
+            for row, note in zip(batch, notes)
+        ]
+        with transaction.atomic():
+            for note, slug in zip(notes, resolve_slugs(bases, max_length)):
+                note.slug = slug
+            Note.objects.bulk_create(notes)
+        created += len(notes)
@@ -0,0 +1,86 @@
+import random
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from notes.benchmarks import benchmark_database
+from notes.models import Note
+
+User = get_user_model()
+
+INDEX_NAME = 'note_author_id_idx'
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер запроса списка заметок автора на большой таблице: '
+        'без индекса (author, id), с индексом, и с выборкой только '
+        'нужных списку колонок.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--authors', type=int, default=10000)
+        parser.add_argument('--text-length', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def seed(self, options):
+        User.objects.bulk_create(
+            User(username=f'user{index}')
+            for index in range(options['authors'])
+        )
+        author_ids = list(User.objects.values_list('id', flat=True))
+        generator = random.Random(options['seed'])
+        text = 'x' * options['text_length']
+        batch_size = 10000
+        for start in range(0, options['rows'], batch_size):
+            stop = min(start + batch_size, options['rows'])
+            with transaction.atomic():
+                Note.objects.bulk_create(
+                    Note(
+                        title=f'Заметка {index}',
+                        text=text,
+                        slug=f'note-{index}',
+                        author_id=generator.choice(author_ids),
+                    )
+                    for index in range(start, stop)
+                )
+        return author_ids
+
+    def measure(self, queryset, author_ids, repeat, generator):
+        started = perf_counter()
+        for _ in range(repeat):
+            list(queryset.filter(author_id=generator.choice(author_ids)))
+        return (perf_counter() - started) / repeat * 1000
+
+    def handle(self, *args, **options):
+        generator = random.Random(options['seed'])
+        with benchmark_database():
+            started = perf_counter()
+            author_ids = self.seed(options)
+            self.stdout.write(
+                f'Наполнение {options["rows"]} строк: '
+                f'{perf_counter() - started:.1f} с'
+            )
+            full = Note.objects.all()
+            narrow = Note.objects.only('id', 'slug', 'title')
+            repeat = options['repeat']
+            with connection.cursor() as cursor:
+                cursor.execute(f'DROP INDEX {INDEX_NAME}')
+            results = [(
+                'без индекса, все колонки',
+                self.measure(full, author_ids, repeat, generator),
+            )]
+            with connection.schema_editor() as editor:
+                editor.add_index(Note, Note._meta.indexes[0])
+            results += [
+                ('индекс, все колонки',
+                 self.measure(full, author_ids, repeat, generator)),
+                ('индекс, id/slug/title',
+                 self.measure(narrow, author_ids, repeat, generator)),
+            ]
+            for name, milliseconds in results:
+                self.stdout.write(f'{name:<28} {milliseconds:>9.2f} мс')
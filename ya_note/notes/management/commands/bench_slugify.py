@@ -0,0 +1,64 @@
+import random
+from timeit import timeit
+
+from django.core.management.base import BaseCommand
+from pytils.translit import slugify
+
+from notes.models import Note
+from notes.slugs import make_slug, slug_cache_clear, slug_cache_info
+
+TITLES = (
+    'Название заметки', 'Список покупок', 'Планы на выходные',
+    'Идеи для проекта', 'Книги, которые стоит прочитать',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает затраты на построение slug при создании заметки '
+        'без кэша (дважды, как в форме и в save) и через кэш slug.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--creates', type=int, default=100000,
+                            help='Сколько созданий заметок смоделировать.')
+        parser.add_argument(
+            '--unique-share', type=float, default=0.2,
+            help='Доля уникальных заголовков, остальные повторяются.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        generator = random.Random(options['seed'])
+        max_length = Note._meta.get_field('slug').max_length
+        titles = [
+            f'Заметка номер {index}'
+            if generator.random() < options['unique_share']
+            else generator.choice(TITLES)
+            for index in range(options['creates'])
+        ]
+
+        def uncached():
+            for title in titles:
+                slugify(title)[:max_length]
+                slugify(title)[:max_length]
+
+        def cached():
+            for title in titles:
+                make_slug(title, max_length)
+                make_slug(title, max_length)
+
+        slug_cache_clear()
+        plain = timeit(uncached, number=1)
+        memoized = timeit(cached, number=1)
+        info = slug_cache_info()
+        creates = len(titles)
+        self.stdout.write(
+            f'Созданий: {creates}, попаданий: {info.hits}, '
+            f'промахов: {info.misses}, в кэше: {info.currsize}'
+        )
+        self.stdout.write(
+            f'Без кэша: {plain / creates * 1e6:.2f} мкс на создание, '
+            f'с кэшем: {memoized / creates * 1e6:.2f} мкс, '
+            f'экономия {(plain - memoized) / creates * 1e6:.2f} мкс'
+        )
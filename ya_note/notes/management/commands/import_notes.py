@@ -0,0 +1,55 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.importer import BATCH_SIZE, import_notes, validate_row
+
+User = get_user_model()
+
+
+def read_rows(file):
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            validate_row(row)
+        except ValidationError as error:
+            raise CommandError(f'Строка {number}: {" ".join(error.messages)}')
+        except ValueError as error:
+            raise CommandError(f'Строка {number}: {error}')
+        yield row
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует заметки пользователя из файла JSON Lines: '
+        'по объекту {"title", "text", "slug"} в строке.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с заметками или - для stdin.')
+        parser.add_argument('--author', required=True,
+                            help='Имя пользователя-автора заметок.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            author = User.objects.get(username=options['author'])
+        except User.DoesNotExist:
+            raise CommandError(
+                f'Пользователь {options["author"]} не найден.'
+            )
+        if options['path'] == '-':
+            created = import_notes(
+                author, read_rows(sys.stdin), options['batch_size']
+            )
+        else:
+            with open(options['path'], encoding='utf-8') as file:
+                created = import_notes(
+                    author, read_rows(file), options['batch_size']
+                )
+        self.stdout.write(f'Импортировано заметок: {created}')
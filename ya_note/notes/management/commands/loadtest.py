@@ -0,0 +1,98 @@
+import json
+import random
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+from notes.benchmarks import (
+    benchmark_database, random_text, run_load, summarize
+)
+from notes.seeding import seed_benchmark
+
+
+def make_plan(generator, worker, mix, requests, accounts):
+    """Последовательность запросов одного виртуального пользователя."""
+    routes, weights = zip(*mix.items())
+    plan = []
+    for index, route in enumerate(
+            generator.choices(routes, weights, k=requests)
+    ):
+        cookies, slugs = generator.choice(accounts)
+        if route == 'list':
+            plan.append((route, 'GET', '/notes/', b'', cookies))
+        elif route == 'detail':
+            slug = generator.choice(slugs)
+            plan.append((route, 'GET', f'/note/{slug}/', b'', cookies))
+        else:
+            body = urlencode({
+                'title': random_text(generator, 3),
+                'text': random_text(generator, 40),
+                'slug': f'load-{worker}-{index}',
+            }).encode()
+            plan.append((route, 'POST', '/add/', body, cookies))
+    return plan
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        route, _, weight = part.partition('=')
+        mix[route.strip()] = float(weight)
+    return mix
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон WSGI-приложения на временной базе: '
+        'список заметок, заметка, создание заметки. '
+        'Выводит req/s и p50/p95/p99 по маршрутам в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20)
+        parser.add_argument('--notes', type=int, default=100,
+                            help='Заметок на пользователя.')
+        parser.add_argument('--concurrency', type=int, default=4)
+        parser.add_argument('--requests', type=int, default=200,
+                            help='Запросов на одного исполнителя.')
+        parser.add_argument('--mode', choices=('thread', 'process'),
+                            default='thread')
+        parser.add_argument(
+            '--mix', type=parse_mix, default='list=50,detail=40,create=10',
+            help='Доли маршрутов list, detail и create.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Файл для отчёта JSON.')
+
+    def handle(self, *args, **options):
+        # Отладочный курсор копит все запросы в памяти и искажает замер.
+        settings.DEBUG = False
+        generator = random.Random(options['seed'])
+        with benchmark_database():
+            accounts = seed_benchmark(
+                options['users'], options['notes'], seed=options['seed']
+            )
+            plans = [
+                make_plan(
+                    generator, worker, options['mix'], options['requests'],
+                    accounts,
+                )
+                for worker in range(options['concurrency'])
+            ]
+            results, elapsed = run_load(
+                get_wsgi_application(), plans, options['mode']
+            )
+        report = summarize(results, elapsed)
+        report['config'] = {
+            key: options[key] for key in (
+                'users', 'notes', 'concurrency', 'requests', 'mode', 'mix',
+                'seed',
+            )
+        }
+        output = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(output)
+        self.stdout.write(output)
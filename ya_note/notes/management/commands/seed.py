@@ -0,0 +1,40 @@
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from notes.seeding import BATCH_SIZE, seed_notes
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу пользователями и заметками для замеров '
+        'на больших объёмах. Данные пишутся пачками, память не растёт '
+        'с числом строк. Выводит отчёт в JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--notes', type=int, default=100000,
+                            help='Всего заметок.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if min(options['users'], options['notes']) < 0:
+            raise CommandError('Объёмы не могут быть отрицательными.')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size должен быть больше 0.')
+        if options['notes'] and not options['users']:
+            raise CommandError('Заметкам нужны авторы: задайте --users.')
+        # Отладочный курсор копит все запросы вместе с огромными
+        # INSERT в памяти.
+        settings.DEBUG = False
+        started = time.perf_counter()
+        report = seed_notes(
+            options['notes'], options['users'], seed=options['seed'],
+            batch_size=options['batch_size'],
+        )
+        report['seconds'] = round(time.perf_counter() - started, 2)
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
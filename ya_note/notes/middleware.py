@@ -0,0 +1,145 @@
+"""
+Профилирование запросов.
+
+Включается настройкой REQUEST_PROFILING. Для каждого запроса меряет
+общее время, число и время SQL-запросов и время отрисовки шаблона,
+отдаёт замеры в заголовке Server-Timing и копит их по представлениям
+в памяти процесса. Каждые REQUEST_PROFILING_FLUSH_EVERY запросов
+накопленное записывается в REQUEST_PROFILING_DIR/<pid>.json, откуда
+его собирает команда profiling_report.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import ExitStack
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+METRICS = ('total', 'sql', 'sql_count', 'render')
+
+
+def percentile(values, share):
+    """Перцентиль share (от 0 до 1) по возрастающему списку values."""
+    if not values:
+        return 0
+    index = min(len(values) - 1, round(share * (len(values) - 1)))
+    return values[index]
+
+
+class ProfileStore:
+    """Последние замеры по каждому представлению в памяти процесса."""
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.samples = defaultdict(self._new_view)
+
+    def _new_view(self):
+        return {metric: deque(maxlen=self.size) for metric in METRICS}
+
+    def add(self, view_name, measures):
+        with self.lock:
+            view = self.samples[view_name]
+            for metric in METRICS:
+                view[metric].append(measures[metric])
+            self.requests += 1
+            return self.requests
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                view_name: {
+                    metric: list(values) for metric, values in view.items()
+                }
+                for view_name, view in self.samples.items()
+            }
+
+    def dump(self, directory):
+        """Записывает замеры процесса в файл <pid>.json в directory."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{os.getpid()}.json'
+        temporary = path.with_suffix('.tmp')
+        temporary.write_text(json.dumps(self.snapshot()), encoding='utf-8')
+        temporary.replace(path)
+        return path
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.requests = 0
+
+
+store = ProfileStore(settings.REQUEST_PROFILING_SAMPLES)
+
+
+class RequestTimer:
+    """Замеры одного запроса: оборачивает выполнение SQL."""
+
+    def __init__(self):
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.render_started = None
+        self.render_time = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - started
+            self.sql_count += 1
+
+    def start_render(self):
+        self.render_started = time.perf_counter()
+
+    def finish_render(self, response):
+        self.render_time = time.perf_counter() - self.render_started
+
+
+class ProfilingMiddleware:
+    """Замеры времени запроса, SQL и отрисовки шаблона."""
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = request.profiling_timer = RequestTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        measures = {
+            'total': (time.perf_counter() - started) * 1000,
+            'sql': timer.sql_time * 1000,
+            'sql_count': timer.sql_count,
+            'render': timer.render_time * 1000,
+        }
+        response['Server-Timing'] = (
+            f'total;dur={measures["total"]:.1f}, '
+            f'sql;dur={measures["sql"]:.1f};desc="{timer.sql_count} SQL", '
+            f'render;dur={measures["render"]:.1f}'
+        )
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        requests = store.add(view_name, measures)
+        if requests % settings.REQUEST_PROFILING_FLUSH_EVERY == 0:
+            store.dump(settings.REQUEST_PROFILING_DIR)
+        return response
+
+    def process_template_response(self, request, response):
+        """Шаблон отрисуется сразу после этого метода: засекаем время."""
+        request.profiling_timer.start_render()
+        response.add_post_render_callback(
+            request.profiling_timer.finish_render
+        )
+        return response
@@ -0,0 +1,60 @@
+# Generated by Django 3.2.15 on 2026-10-18 05:45
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+CREATE_FTS = (
+    "CREATE VIRTUAL TABLE notes_note_fts USING fts5("
+    "title, text, content='notes_note', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER notes_note_fts_insert AFTER INSERT ON notes_note BEGIN "
+    "INSERT INTO notes_note_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "CREATE TRIGGER notes_note_fts_delete AFTER DELETE ON notes_note BEGIN "
+    "INSERT INTO notes_note_fts(notes_note_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); END",
+    "CREATE TRIGGER notes_note_fts_update AFTER UPDATE ON notes_note BEGIN "
+    "INSERT INTO notes_note_fts(notes_note_fts, rowid, title, text) "
+    "VALUES ('delete', old.id, old.title, old.text); "
+    "INSERT INTO notes_note_fts(rowid, title, text) "
+    "VALUES (new.id, new.title, new.text); END",
+    "INSERT INTO notes_note_fts(notes_note_fts) VALUES ('rebuild')",
+)
+DROP_FTS = (
+    'DROP TRIGGER IF EXISTS notes_note_fts_insert',
+    'DROP TRIGGER IF EXISTS notes_note_fts_delete',
+    'DROP TRIGGER IF EXISTS notes_note_fts_update',
+    'DROP TABLE IF EXISTS notes_note_fts',
+)
+
+
+def create_fts(apps, schema_editor):
+    """Индекс FTS5 есть только у SQLite, собранной с этим модулем."""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            cursor.execute(CREATE_FTS[0])
+        except OperationalError:
+            return
+        for statement in CREATE_FTS[1:]:
+            cursor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_FTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notes', '0002_note_author_id_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
@@ -1,7 +1,7 @@
 from django.conf import settings
 from django.db import models
 
-from pytils.translit import slugify
+from .slugs import make_slug
 
 
 class Note(models.Model):
@@ -26,13 +26,20 @@ class Note(models.Model):
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
+        # Выборки по автору обслуживает составной индекс (author, id).
+        db_index=False,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(fields=('author', 'id'), name='note_author_id_idx'),
+        )
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
         if not self.slug:
             max_slug_length = self._meta.get_field('slug').max_length
-            self.slug = slugify(self.title)[:max_slug_length]
+            self.slug = make_slug(self.title, max_slug_length)
         super().save(*args, **kwargs)
@@ -0,0 +1,45 @@
+"""
+Постраничный вывод заметок по ключу (keyset pagination).
+
+Следующая страница начинается строго после последнего id предыдущей,
+поэтому запрос не зависит от глубины листания, в отличие от OFFSET.
+Позиция передаётся в URL непрозрачным курсором.
+"""
+import base64
+
+# id заметки — положительное знаковое 64-битное целое: большее число
+# база не сравнит и поднимет OverflowError уже при выполнении запроса.
+MAX_ID = 2 ** 63 - 1
+
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Достаёт id из курсора; для испорченного поднимает ValueError."""
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        pk = int(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Некорректный курсор.')
+    if not 0 < pk <= MAX_ID:
+        raise ValueError('Некорректный курсор.')
+    return pk
+
+
+def paginate(queryset, cursor=None, size=50):
+    """
+    Возвращает страницу в виде QuerySet и курсор следующей страницы.
+
+    Сначала выбираются только id страницы (по индексу, без тяжёлых
+    условий в самой выборке страницы), затем сама страница по этим id.
+    Если следующей страницы нет, вместо курсора возвращается None.
+    """
+    queryset = queryset.order_by('id')
+    ids = queryset
+    if cursor:
+        ids = ids.filter(id__gt=decode_cursor(cursor))
+    ids = list(ids.values_list('id', flat=True)[:size + 1])
+    next_cursor = encode_cursor(ids[size - 1]) if len(ids) > size else None
+    return queryset.filter(id__in=ids[:size]), next_cursor
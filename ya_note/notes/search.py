@@ -0,0 +1,54 @@
+"""
+Поиск по заметкам.
+
+На SQLite используется полнотекстовый индекс FTS5 notes_note_fts,
+который миграция 0003 создаёт и поддерживает триггерами. Если индекса
+нет (другая СУБД или SQLite без FTS5), поиск идёт через icontains.
+"""
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'notes_note_fts'
+
+
+def fts_available(using='default'):
+    """Есть ли в базе полнотекстовый индекс заметок."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite':
+        return False
+    if not hasattr(connection, 'notes_fts_available'):
+        connection.notes_fts_available = (
+            FTS_TABLE in connection.introspection.table_names()
+        )
+    return connection.notes_fts_available
+
+
+def fts_query(query):
+    """
+    Запрос FTS5 из пользовательской строки.
+
+    Каждое слово берётся в кавычки, чтобы символы синтаксиса FTS5
+    не ломали запрос, и ищется по префиксу; слова объединяются через И.
+    Непечатаемые символы считаются пробелами: NUL в запросе SQLite
+    отвергает с ошибкой. Если слов не осталось, возвращается ''.
+    """
+    query = ''.join(char if char.isprintable() else ' ' for char in query)
+    return ' '.join(
+        '"{}"*'.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+def search_notes(queryset, query):
+    """Заметки из queryset, в заголовке или тексте которых есть query."""
+    if fts_available(queryset.db):
+        match = fts_query(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            (match,),
+        ))
+    return queryset.filter(
+        Q(title__icontains=query) | Q(text__icontains=query)
+    )
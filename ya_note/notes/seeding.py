@@ -0,0 +1,157 @@
+"""
+Генерация больших объёмов данных для замеров.
+
+Пользователи и заметки создаются потоком: генераторы выдают объекты,
+которые пачками по batch_size сохраняются через bulk_create, каждая
+пачка в своей транзакции. В памяти одновременно только одна пачка.
+
+Первичные ключи назначаются заранее, следом за уже занятыми: SQLite
+в Django 3.2 не возвращает id из bulk_create, а заметкам нужны id
+авторов. slug строится из заголовка с суффиксом -id, поэтому
+сгенерированные заметки не совпадают между собой; совпадения
+с уже существующими разводит resolve_slugs одним запросом на пачку.
+При одинаковом seed на пустой базе данные получаются одинаковыми.
+"""
+import random
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Max
+from django.test.client import Client
+
+from .benchmarks import random_text
+from .importer import resolve_slugs
+from .models import Note
+from .slugs import make_slug
+
+User = get_user_model()
+
+BATCH_SIZE = 2000
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def save_in_batches(model, objects, batch_size=BATCH_SIZE, prepare=None):
+    """
+    Сохраняет поток объектов пачками; возвращает их число.
+
+    prepare, если задан, вызывается для каждой пачки перед вставкой
+    внутри той же транзакции.
+    """
+    saved = 0
+    for chunk in chunked(objects, batch_size):
+        with transaction.atomic():
+            if prepare is not None:
+                prepare(chunk)
+            model.objects.bulk_create(chunk)
+        saved += len(chunk)
+    return saved
+
+
+def next_pk(model):
+    return (model.objects.aggregate(last=Max('pk'))['last'] or 0) + 1
+
+
+def generate_users(first_pk, count, prefix='user'):
+    password = make_password(None)
+    for pk in range(first_pk, first_pk + count):
+        yield User(pk=pk, username=f'{prefix}{pk}', password=password)
+
+
+def pick_author(generator, first_pk, count):
+    """
+    Автор заметки.
+
+    Распределение неравномерное: у первых пользователей заметок
+    намного больше, чем у последних, как у активных и редких авторов.
+    """
+    return first_pk + int(count * generator.random() ** 3)
+
+
+def assign_slugs(notes):
+    max_length = Note._meta.get_field('slug').max_length
+    bases = []
+    for note in notes:
+        suffix = f'-{note.pk}'
+        base = make_slug(note.title, max_length - len(suffix))
+        bases.append(base + suffix)
+    for note, slug in zip(notes, resolve_slugs(bases, max_length)):
+        note.slug = slug
+
+
+def seed_notes(note_count, user_count, seed=0, batch_size=BATCH_SIZE,
+               even_authors=False):
+    """
+    Наполняет базу пользователями и их заметками.
+
+    При even_authors заметки раздаются пользователям по очереди,
+    поровну. Возвращает словарь с числом созданных объектов каждого вида.
+    """
+    generator = random.Random(seed)
+    first_user = next_pk(User)
+    users = save_in_batches(
+        User, generate_users(first_user, user_count), batch_size
+    )
+    first_note = next_pk(Note)
+    notes = save_in_batches(
+        Note,
+        (
+            Note(
+                pk=pk,
+                title=random_text(generator, 3),
+                text=random_text(generator, 40),
+                author_id=(
+                    first_user + (pk - first_note) % user_count
+                    if even_authors
+                    else pick_author(generator, first_user, user_count)
+                ),
+            )
+            for pk in range(first_note, first_note + note_count)
+        ),
+        batch_size,
+        prepare=assign_slugs,
+    )
+    return {'users': users, 'notes': notes}
+
+
+def session_cookies(users):
+    """Cookies сессий, в которых пользователи users уже вошли на сайт."""
+    cookies = []
+    for user in users:
+        client = Client()
+        client.force_login(user)
+        cookies.append({'sessionid': client.cookies['sessionid'].value})
+    return cookies
+
+
+def seed_benchmark(user_count, notes_per_user, seed=0):
+    """
+    Наполняет базу для нагрузочного замера.
+
+    У каждого пользователя ровно notes_per_user заметок. Возвращает
+    для каждого созданного пользователя cookies его сессии и slug
+    его заметок.
+    """
+    first_user = next_pk(User)
+    seed_notes(
+        user_count * notes_per_user, user_count, seed=seed,
+        even_authors=True,
+    )
+    users = list(User.objects.filter(pk__gte=first_user).order_by('pk'))
+    slugs = {user.pk: [] for user in users}
+    notes = Note.objects.filter(author_id__gte=first_user).order_by('pk')
+    for author_id, slug in notes.values_list('author_id', 'slug'):
+        slugs[author_id].append(slug)
+    return [
+        (cookies, slugs[user.pk])
+        for user, cookies in zip(users, session_cookies(users))
+    ]
@@ -0,0 +1,31 @@
+"""
+Построение slug заметок.
+
+Транслитерация pytils заметно дороже поиска в словаре, а заголовки
+часто повторяются (например, заголовок по умолчанию), поэтому
+результаты кэшируются в ограниченном LRU-кэше процесса.
+Статистика попаданий доступна через slug_cache_info().
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from pytils.translit import slugify
+
+
+@lru_cache(maxsize=settings.NOTES_SLUG_CACHE_SIZE)
+def _cached_slugify(title):
+    return slugify(title)
+
+
+def make_slug(title, max_length):
+    """Строит slug из заголовка и обрезает до max_length символов."""
+    return _cached_slugify(title)[:max_length]
+
+
+def slug_cache_info():
+    """Попадания, промахи и заполненность кэша slug."""
+    return _cached_slugify.cache_info()
+
+
+def slug_cache_clear():
+    _cached_slugify.cache_clear()
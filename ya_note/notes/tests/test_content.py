@@ -1,11 +1,15 @@
 # news/tests/test_content.py
+from http import HTTPStatus
+from unittest import mock
+
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.test.client import Client
 from django.urls import reverse
 
 from notes.models import Note
 from notes.forms import NoteForm
+from notes.pagination import encode_cursor
 
 User = get_user_model()
 
@@ -41,6 +45,12 @@ class TestRoutes(TestCase):
         self.assertEqual(note_from_object_list.slug, self.note.slug)
         self.assertEqual(note_from_object_list.author, self.note.author)
 
+    def test_notes_list_loads_only_listed_columns(self):
+        """Список заметок не загружает текст заметок."""
+        response = self.author_client.get(self.list_url)
+        note = response.context['object_list'][0]
+        self.assertEqual(note.get_deferred_fields(), {'text', 'author_id'})
+
     def test_notes_list_for_reader_user(self):
         """Заметка не появляется в списках заметок не автора."""
         response = self.reader_client.get(self.list_url)
@@ -58,3 +68,73 @@ class TestRoutes(TestCase):
                 response = self.author_client.get(url)
                 self.assertIn('form', response.context)
                 self.assertIsInstance(response.context['form'], NoteForm)
+
+
+class TestNotesListPages(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Лев Толстой')
+        titles = ('Война и мир', 'Анна Каренина', 'Воскресение',
+                  'Детство', 'Отрочество')
+        for index, title in enumerate(titles):
+            Note.objects.create(title=title,
+                                text=f'Черновик номер {index}',
+                                slug=f'note-{index}',
+                                author=cls.author)
+        cls.list_url = reverse('notes:list')
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+
+    def get_all_pages(self, **params):
+        notes = []
+        response = self.author_client.get(self.list_url, params)
+        while True:
+            notes += [note.title for note in response.context['object_list']]
+            cursor = response.context['next_cursor']
+            if cursor is None:
+                return notes
+            response = self.author_client.get(
+                self.list_url, {**params, 'cursor': cursor}
+            )
+
+    @override_settings(NOTES_COUNT_ON_LIST_PAGE=2)
+    def test_list_is_paginated(self):
+        """Список листается курсором по порядку и без повторов."""
+        response = self.author_client.get(self.list_url)
+        self.assertEqual(len(response.context['object_list']), 2)
+        self.assertEqual(
+            self.get_all_pages(),
+            list(Note.objects.order_by('id').values_list('title', flat=True))
+        )
+
+    @override_settings(NOTES_COUNT_ON_LIST_PAGE=1)
+    def test_search(self):
+        """Поиск находит заметки по началу слов заголовка и текста."""
+        self.assertEqual(self.get_all_pages(q='ВОЙНА'), ['Война и мир'])
+        self.assertEqual(self.get_all_pages(q='номер 3'), ['Детство'])
+        self.assertEqual(
+            self.get_all_pages(q='черновик'),
+            list(Note.objects.order_by('id').values_list('title', flat=True))
+        )
+
+    def test_forged_cursor_not_found(self):
+        """Курсор с id вне диапазона ключей отвечает ошибкой 404."""
+        for pk in (0, -1, 2 ** 63):
+            with self.subTest(pk=pk):
+                response = self.author_client.get(
+                    self.list_url, {'cursor': encode_cursor(pk)}
+                )
+                self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_search_with_control_characters(self):
+        """Управляющие символы в запросе не ломают поиск."""
+        self.assertEqual(self.get_all_pages(q='\x00'), [])
+        self.assertEqual(self.get_all_pages(q='Война\x00'), ['Война и мир'])
+
+    def test_search_without_fts(self):
+        """Без полнотекстового индекса поиск идёт по подстроке."""
+        with mock.patch('notes.search.fts_available', return_value=False):
+            self.assertEqual(self.get_all_pages(q='Карен'), ['Анна Каренина'])
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+
+from notes.db import check_connections
+
+
+class TestDatabaseConnections(TestCase):
+
+    def test_pragmas_applied(self):
+        """PRAGMA из настроек применяются к каждому соединению."""
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            # NORMAL.
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+
+    def test_health_check_closes_broken_connection(self):
+        """Перед запросом неработающее постоянное соединение закрывается."""
+        connection.ensure_connection()
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'close') as close:
+            check_connections()
+        close.assert_called_once()
@@ -1,10 +1,17 @@
+import json
+import tempfile
 from http import HTTPStatus
+from io import StringIO
 
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
 from django.test import Client, TestCase
 from django.urls import reverse
 from pytils.translit import slugify
 
+from notes.importer import import_notes
+from notes.slugs import make_slug, slug_cache_clear, slug_cache_info
 from notes.models import Note
 from notes.forms import WARNING
 
@@ -70,6 +77,18 @@ class TestNoteCreation(TestCase):
         self.assertEqual(new_note.text, self.form_data['text'])
         self.assertEqual(new_note.author, self.author)
 
+    def test_slug_cache(self):
+        """
+        Повторная транслитерация того же заголовка берётся из кэша
+        и даёт тот же slug, что и pytils.
+        """
+        slug_cache_clear()
+        title = self.form_data['title']
+        self.assertEqual(make_slug(title, 100), slugify(title))
+        self.assertEqual(make_slug(title, 5), slugify(title)[:5])
+        info = slug_cache_info()
+        self.assertEqual((info.hits, info.misses), (1, 1))
+
 
 class TestCommentEditDelete(TestCase):
 
@@ -138,3 +157,99 @@ class TestCommentEditDelete(TestCase):
         response = self.not_author_client.post(self.delete_url)
         self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
         self.assertEqual(Note.objects.count(), node_count_old)
+
+
+class TestNoteImport(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='автор')
+        cls.note = Note.objects.create(title='Заголовок',
+                                       text='Текст',
+                                       author=cls.author)
+
+    def test_import_resolves_slug_collisions(self):
+        """
+        Совпадающие slug в пачке и в базе разводятся суффиксами,
+        а занятость проверяется одним запросом на пачку.
+        """
+        rows = [
+            {'title': 'Заголовок', 'text': 'Первый'},
+            {'title': 'Заголовок', 'text': 'Второй'},
+            {'title': 'Другой', 'text': 'Третий', 'slug': 'zagolovok-2'},
+        ]
+        # slug__in, SAVEPOINT, INSERT и RELEASE SAVEPOINT.
+        with self.assertNumQueries(4):
+            created = import_notes(self.author, rows)
+        self.assertEqual(created, len(rows))
+        slugs = dict(Note.objects.values_list('text', 'slug'))
+        self.assertEqual(slugs['Первый'], 'zagolovok-2')
+        self.assertEqual(slugs['Второй'], 'zagolovok-3')
+        self.assertEqual(slugs['Третий'], 'zagolovok-2-2')
+
+    def test_import_notes_command(self):
+        """Команда import_notes читает заметки из файла JSON Lines."""
+        rows = [{'title': f'Заметка {index}', 'text': 'Текст'}
+                for index in range(5)]
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl') as file:
+            file.write('\n'.join(json.dumps(row) for row in rows))
+            file.flush()
+            call_command('import_notes', file.name, author='автор',
+                         batch_size=2, stdout=StringIO())
+        self.assertEqual(
+            Note.objects.filter(author=self.author).count(), len(rows) + 1
+        )
+
+    def test_import_empty_slug(self):
+        """Пустой slug или null строится из заголовка."""
+        import_notes(self.author, [
+            {'title': 'Первая', 'text': 'Текст', 'slug': None},
+            {'title': 'Вторая', 'text': 'Текст', 'slug': ''},
+        ])
+        self.assertTrue(Note.objects.filter(slug='pervaya').exists())
+        self.assertTrue(Note.objects.filter(slug='vtoraya').exists())
+
+    def test_import_rejects_bad_slug(self):
+        """Некорректный slug не попадает в базу."""
+        with self.assertRaises(ValidationError):
+            import_notes(self.author, [{'title': 'Т', 'slug': 'привет мир'}])
+        self.assertEqual(Note.objects.count(), 1)
+
+    def test_import_title_without_slug_letters(self):
+        """Заголовок, от которого не остаётся slug, получает запасной."""
+        import_notes(self.author, [
+            {'title': '!!!', 'text': 'Текст'},
+            {'title': '???', 'text': 'Текст'},
+        ])
+        self.assertEqual(
+            set(Note.objects.filter(text='Текст', title__in=('!!!', '???'))
+                .values_list('slug', flat=True)),
+            {'note', 'note-2'},
+        )
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(reverse('notes:list'))
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_import_rejects_invalid_fields(self):
+        """Слишком длинный заголовок и нестроковые поля отклоняются."""
+        for row in (
+            {'title': 'Т' * 101, 'text': 'Текст'},
+            {'title': 5, 'text': 'Текст'},
+            {'title': 'Т', 'text': ['a']},
+        ):
+            with self.subTest(row=row), self.assertRaises(ValidationError):
+                import_notes(self.author, [row])
+        self.assertEqual(Note.objects.count(), 1)
+
+    def test_import_notes_command_rejects_bad_rows(self):
+        """Команда сообщает номер некорректной строки файла."""
+        for line in ('{"title": "Т", "slug": "привет мир"}', '["Т"]'):
+            with self.subTest(line=line), \
+                    tempfile.NamedTemporaryFile('w', suffix='.jsonl') as file:
+                file.write(f'{{"title": "Заметка"}}\n{line}\n')
+                file.flush()
+                with self.assertRaisesRegex(CommandError, 'Строка 2'):
+                    call_command('import_notes', file.name, author='автор',
+                                 stdout=StringIO())
+        self.assertEqual(Note.objects.count(), 1)
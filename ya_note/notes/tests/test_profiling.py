@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from notes.middleware import store
+
+
+User = get_user_model()
+
+
+class TestProfiling(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='автор')
+        cls.list_url = reverse('notes:list')
+
+    @override_settings(REQUEST_PROFILING=True)
+    def test_profiling_middleware(self):
+        """
+        Профилировщик отдаёт замеры в Server-Timing, а команда
+        profiling_report собирает их из файлов процессов.
+        """
+        store.clear()
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(self.list_url)
+        self.assertIn('sql;dur=', response['Server-Timing'])
+        output = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            store.dump(directory)
+            call_command('profiling_report', dir=directory, json=True,
+                         stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['notes:list']['requests'], 1)
+        self.assertGreater(report['notes:list']['sql_count_p50'], 0)
+
+
+class TestTestProfiler(TestCase):
+
+    SAMPLE = (
+        'import time\n\n\n'
+        'def test_fast():\n    pass\n\n\n'
+        'def test_slow():\n    time.sleep(0.3)\n'
+    )
+
+    def test_report_and_budget(self):
+        """
+        Профилировщик пишет отчёт со временем тестов и роняет тест,
+        превысивший бюджет.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            directory = Path(directory)
+            (directory / 'test_sample.py').write_text(self.SAMPLE)
+            report = directory / 'profile.json'
+            result = subprocess.run(
+                [
+                    sys.executable, '-m', 'pytest', '-p', 'no:django',
+                    '-p', 'notes.pytest_profiler', '-p', 'no:cacheprovider',
+                    '--test-time-budget=0.2', f'--profile-report={report}',
+                ],
+                cwd=directory, capture_output=True, text=True,
+                env={**os.environ, 'PYTHONPATH': str(settings.BASE_DIR)},
+            )
+            self.assertEqual(result.returncode, 1)
+            self.assertIn('при бюджете 0.200 с', result.stdout)
+            tests = json.loads(report.read_text('utf-8'))['tests']
+            self.assertTrue(report.with_suffix('.html').exists())
+        self.assertTrue(tests[0]['nodeid'].endswith('test_slow'))
+        self.assertEqual(tests[0]['outcome'], 'failed')
+        self.assertGreaterEqual(tests[0]['call'], 0.3)
@@ -0,0 +1,86 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+from notes.urls import app_name, urlpatterns
+from yanote.urls import auth_urls
+
+
+User = get_user_model()
+
+
+class TestQueryBudgets(TestCase):
+    """Страницы не выходят за бюджет SQL-запросов."""
+
+    # Сколько SQL-запросов может сделать GET-запрос к странице
+    # для клиентов (аноним, автор заметки, не автор).
+    QUERY_BUDGETS = {
+        'notes:home': (0, 2, 2),
+        'notes:add': (0, 2, 2),
+        'notes:edit': (0, 3, 3),
+        'notes:detail': (0, 3, 3),
+        'notes:delete': (0, 3, 3),
+        'notes:list': (0, 4, 3),
+        'notes:success': (0, 2, 2),
+        'users:login': (0, 2, 2),
+        'users:logout': (0, 4, 4),
+        'users:signup': (0, 2, 2),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='Лев Толстой')
+        cls.reader = User.objects.create(username='Читатель простой')
+        cls.note = Note.objects.create(title='Заголовок',
+                                       text='Текст',
+                                       author=cls.author,)
+        slug_urls = ('notes:edit', 'notes:detail', 'notes:delete')
+        cls.urls = {
+            name: reverse(
+                name, args=(cls.note.slug,) if name in slug_urls else None
+            )
+            for name in cls.QUERY_BUDGETS
+        }
+
+    def get_clients(self):
+        author_client, reader_client = Client(), Client()
+        author_client.force_login(self.author)
+        reader_client.force_login(self.reader)
+        return (
+            ('аноним', Client()),
+            ('автор', author_client),
+            ('не автор', reader_client),
+        )
+
+    def test_query_budgets_cover_all_urls(self):
+        """В таблице бюджетов есть все страницы проекта."""
+        url_names = {
+            f'{app_name}:{pattern.name}' for pattern in urlpatterns
+        } | {
+            f'{auth_urls[1]}:{pattern.name}' for pattern in auth_urls[0]
+        }
+        self.assertEqual(url_names, set(self.QUERY_BUDGETS))
+
+    def test_query_budgets(self):
+        """Число SQL-запросов каждой страницы не больше бюджета."""
+        for name, budgets in self.QUERY_BUDGETS.items():
+            # Клиенты каждый раз новые: выход из учётной записи
+            # разлогинивает клиента для следующих запросов.
+            for (client_name, client), budget in zip(
+                    self.get_clients(), budgets
+            ):
+                with self.subTest(url=name, client=client_name):
+                    with CaptureQueriesContext(connection) as context:
+                        client.get(self.urls[name])
+                    queries = '\n\n'.join(
+                        query['sql'] for query in context.captured_queries
+                    )
+                    self.assertLessEqual(
+                        len(context), budget,
+                        f'{len(context)} SQL-запросов при бюджете '
+                        f'{budget}:\n\n{queries}'
+                    )
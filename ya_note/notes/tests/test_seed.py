@@ -0,0 +1,78 @@
+import json
+from http import HTTPStatus
+import random
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from notes.benchmarks import random_text
+from notes.models import Note
+from notes.seeding import seed_benchmark, seed_notes
+from notes.slugs import make_slug
+
+
+User = get_user_model()
+
+
+class TestSeed(TestCase):
+
+    def test_seed_command(self):
+        """Команда seed создаёт пользователей и заметки пачками."""
+        output = StringIO()
+        call_command('seed', users=4, notes=30, batch_size=7, stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(report, {**report, 'users': 4, 'notes': 30})
+        self.assertEqual(User.objects.count(), 4)
+        self.assertEqual(Note.objects.count(), 30)
+
+    def test_seeded_slugs_unique(self):
+        """Адреса заметок не совпадают ни между собой, ни с занятыми."""
+        author = User.objects.create(username='автор')
+        occupied = Note.objects.create(title='Занятый', text='Текст',
+                                       author=author)
+        # Первая сгенерированная заметка получит id следом за занятой,
+        # а её заголовок — первые слова генератора с тем же seed.
+        first_pk = occupied.pk + 1
+        title = random_text(random.Random(1), 3)
+        occupied.slug = f'{make_slug(title, 90)}-{first_pk}'
+        occupied.save()
+        seed_notes(50, 3, seed=1, batch_size=20)
+        slugs = list(Note.objects.values_list('slug', flat=True))
+        self.assertEqual(len(slugs), len(set(slugs)))
+        self.assertEqual(
+            Note.objects.get(pk=first_pk).slug, f'{occupied.slug}-2'
+        )
+
+    def test_seed_is_deterministic(self):
+        """Один и тот же seed даёт одни и те же данные."""
+        def seeded():
+            return list(
+                Note.objects.order_by('-pk')[:10].values_list(
+                    'title', 'text'
+                )
+            )
+
+        seed_notes(10, 2, seed=5)
+        first = seeded()
+        seed_notes(10, 2, seed=5)
+        self.assertEqual(seeded(), first)
+
+    def test_seed_benchmark(self):
+        """
+        Данные для замеров: заметок у всех поровну, а cookies сессий
+        открывают заметки от имени их авторов.
+        """
+        accounts = seed_benchmark(3, 2)
+        self.assertEqual([len(slugs) for _, slugs in accounts], [2, 2, 2])
+        for cookies, slugs in accounts:
+            client = Client()
+            client.cookies['sessionid'] = cookies['sessionid']
+            for slug in slugs:
+                with self.subTest(slug=slug):
+                    response = client.get(
+                        reverse('notes:detail', args=(slug,))
+                    )
+                    self.assertEqual(response.status_code, HTTPStatus.OK)
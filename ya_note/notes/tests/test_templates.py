@@ -0,0 +1,39 @@
+import runpy
+import tempfile
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+
+from notes.templating import precompile_templates
+
+
+class TestTemplatePrecompile(TestCase):
+
+    def test_precompile_templates(self):
+        """При старте компилируются все шаблоны проекта."""
+        self.assertEqual(
+            precompile_templates(),
+            len(list((settings.BASE_DIR / 'templates').rglob('*.html'))),
+        )
+
+    def test_templates_cached_independent_of_debug(self):
+        """Загрузчик шаблонов выбирается TEMPLATES_CACHED, а не DEBUG."""
+        project = runpy.run_path(
+            str(settings.BASE_DIR / 'yanote' / 'settings.py')
+        )
+        loader, _ = project['TEMPLATES'][0]['OPTIONS']['loaders'][0]
+        self.assertTrue(project['TEMPLATES_CACHED'])
+        self.assertEqual(loader, 'django.template.loaders.cached.Loader')
+
+    def test_precompile_fails_on_broken_template(self):
+        """Ошибка в шаблоне останавливает запуск с именем шаблона."""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(f'{directory}/broken.html', 'w') as file:
+                file.write('{% if %}')
+            templates = [{**settings.TEMPLATES[0], 'DIRS': [directory]}]
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaisesRegex(
+                    ImproperlyConfigured, 'broken.html'
+                ):
+                    precompile_templates()
@@ -1,9 +1,13 @@
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
 from django.urls import reverse_lazy
 from django.views import generic
 
 from .forms import NoteForm
 from .models import Note
+from .pagination import paginate
+from .search import search_notes
 
 
 class Home(generic.TemplateView):
@@ -50,9 +54,31 @@ class NoteDelete(NoteBase, generic.DeleteView):
 
 
 class NotesList(NoteBase, generic.ListView):
-    """Список всех заметок пользователя."""
+    """Список заметок пользователя: постранично и с поиском."""
     template_name = 'notes/list.html'
 
+    def get_queryset(self):
+        """В списке выводятся только id, slug и заголовок."""
+        queryset = super().get_queryset().only('id', 'slug', 'title')
+        self.query = self.request.GET.get('q', '').strip()
+        if self.query:
+            queryset = search_notes(queryset, self.query)
+        try:
+            notes, self.next_cursor = paginate(
+                queryset,
+                cursor=self.request.GET.get('cursor'),
+                size=settings.NOTES_COUNT_ON_LIST_PAGE,
+            )
+        except ValueError:
+            raise Http404('Страница списка не найдена.')
+        return notes
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['next_cursor'] = self.next_cursor
+        return context
+
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
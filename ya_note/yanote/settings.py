@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'notes.middleware.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -33,12 +34,24 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'yanote.urls'
 
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+# Кэширующий загрузчик: шаблон читается с диска и разбирается один раз
+# на процесс, независимо от DEBUG. False — перечитывать шаблоны при
+# каждом обращении, чтобы правки были видны без перезапуска сервера.
+TEMPLATES_CACHED = True
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+            ] if TEMPLATES_CACHED else TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
@@ -49,6 +62,10 @@ TEMPLATES = [
     },
 ]
 
+# Компилировать шаблоны проекта при загрузке WSGI/ASGI-приложения
+# воркером: ошибка в шаблоне не даст воркеру запуститься.
+TEMPLATES_PRECOMPILE = True
+
 WSGI_APPLICATION = 'yanote.wsgi.application'
 
 
@@ -56,9 +73,26 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами до 10 минут; 0 — закрывать
+        # после каждого запроса.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Открывать соединения с базой при загрузке WSGI-приложения воркером.
+DATABASE_WARM_UP = True
+
+# Выполняются при открытии каждого соединения с SQLite.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Отрицательное значение — размер кэша страниц в КиБ.
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -87,3 +121,14 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')
+
+NOTES_COUNT_ON_LIST_PAGE = 50
+
+# Сколько заголовков держать в LRU-кэше транслитерации slug.
+NOTES_SLUG_CACHE_SIZE = 4096
+
+# Профилирование запросов: Server-Timing и сводка profiling_report.
+REQUEST_PROFILING = False
+REQUEST_PROFILING_DIR = BASE_DIR / 'profiling'
+REQUEST_PROFILING_SAMPLES = 10000
+REQUEST_PROFILING_FLUSH_EVERY = 100